@@ -0,0 +1,117 @@
+"""
+Micro benchmarks for the hot paths of the configuration framework.
+
+Each module can be executed on its own from the root of the repository, e.g.
+
+    $ python -m benchmarks.sections
+
+The suite runs the hot paths across sizes and shapes and writes the results as
+JSON, to compare them between releases:
+
+    $ python -m benchmarks.suite --output results.json
+
+The benchmarks are not part of the package and are not shipped to PyPI.
+"""
+
+# standard lib
+import time
+import tracemalloc
+from typing import Callable
+
+
+def generate(n_keys: int, fanout: int = 10, prefix: str = "k") -> dict:
+    """Generates a synthetic, nested configuration with (roughly) `n_keys`
+    leaf values. Each section holds `fanout` entries, sections are nested
+    until the requested number of leaves is reached.
+
+    :param n_keys: Number of leaf values to generate
+    :param fanout: Number of entries per section
+    :param prefix: Prefix of the generated keys
+    :return: generated configuration
+    """
+    if n_keys <= fanout:
+        return {f"{prefix}{i}": i for i in range(n_keys)}
+
+    per_child = -(-n_keys // fanout)
+    conf = {}
+    remaining = n_keys
+    i = 0
+    while remaining > 0:
+        n = min(per_child, remaining)
+        conf[f"{prefix}{i}"] = generate(n, fanout, prefix)
+        remaining -= n
+        i += 1
+    return conf
+
+
+def dump_toml(data: dict, prefix: str = "") -> str:
+    """Writes a generated configuration as TOML, without any TOML library.
+
+    :param data: generated configuration, values are integers
+    :param prefix: name of the current table
+    :return: TOML document
+    """
+    lines = [f"[{prefix}]"] if prefix else []
+    tables = []
+    for k, v in data.items():
+        if isinstance(v, dict):
+            tables.append(dump_toml(v, f"{prefix}.{k}" if prefix else k))
+        else:
+            lines.append(f"{k} = {v}")
+    return "\n".join(lines + tables) + "\n"
+
+
+def first_path(conf: dict, seperator: str = ".") -> str:
+    """Returns the dotted path of the first leaf in a generated configuration.
+
+    :param conf: Configuration to walk through
+    :param seperator: Seperator character of the dot-notation
+    :return: dotted path to the leaf
+    """
+    keys = []
+    while isinstance(conf, dict):
+        k = next(iter(conf))
+        keys.append(k)
+        conf = conf[k]
+    return seperator.join(keys)
+
+
+def measure(fn: Callable, min_time: float = 0.2) -> float:
+    """Calls `fn` repeatedly for at least `min_time` seconds.
+
+    :param fn: Function to benchmark, called without arguments
+    :param min_time: Minimum runtime in seconds
+    :return: operations per second
+    """
+    n = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        fn()
+        n += 1
+        elapsed = time.perf_counter() - start
+    return n / elapsed
+
+
+def peak_memory(fn: Callable) -> int:
+    """Calls `fn` once and traces the memory it allocates.
+
+    :param fn: Function to benchmark, called without arguments
+    :return: peak of the allocated memory in bytes
+    """
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def report(name: str, ops: float):
+    """Prints a single benchmark result in a human readable format.
+
+    :param name: Name of the benchmark
+    :param ops: Operations per second
+    """
+    print(f"{name:<50} {ops:>15,.1f} ops/s")
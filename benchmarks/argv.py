@@ -0,0 +1,31 @@
+"""
+Measures loading many command line overrides on top of large defaults,
+compared to merging the same overrides as a dictionary.
+"""
+
+# first party
+from benchmarks import generate, measure, report
+from yacf import Argv, Configuration
+from yacf.utils import flatten, unflatten
+
+OVERRIDES = 10_000
+
+
+def main():
+    defaults = generate(100_000)
+    leaves = [k for k, v in flatten(defaults, ".").items() if not isinstance(v, dict)]
+    overrides = {k: n for n, k in enumerate(leaves[:OVERRIDES])}
+    args = [f"--{k}={v}" for k, v in overrides.items()]
+
+    report(
+        f"load {OVERRIDES:,} arguments (100k keys)",
+        measure(lambda: Configuration(defaults, Argv(args)).load()),
+    )
+    report(
+        f"load {OVERRIDES:,} keys as nested dict (100k keys)",
+        measure(lambda: Configuration(defaults, unflatten(overrides, ".")).load()),
+    )
+
+
+if __name__ == "__main__":
+    main()
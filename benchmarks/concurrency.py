@@ -0,0 +1,78 @@
+"""
+Stress test for concurrent readers while the configuration is reloaded.
+
+Each reader checks that it never sees a torn configuration: the writer always
+sets all keys of the section `a` to the same value, hence a reader must never
+see different values within one snapshot.
+
+Note, that the read throughput of CPython is bound by the global interpreter
+lock. Readers do not block each other or the writer, but the throughput does
+only scale with the number of threads on a free-threaded interpreter.
+"""
+
+# standard lib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# first party
+from benchmarks import generate, report
+from yacf import Configuration
+
+DURATION = 1.0
+
+
+def main():
+    with tempfile.TemporaryDirectory() as d:
+        fp = os.path.join(d, "conf.json")
+
+        def write(n: int):
+            with open(fp, "w") as f:
+                json.dump({"a": {"x": n, "y": n, "z": n}, "b": generate(10_000)}, f)
+
+        write(0)
+        conf = Configuration(fp, index=True).load()
+
+        for threads in [1, 2, 4, 8]:
+            stop = threading.Event()
+            reads = [0] * threads
+            reloads = [0]
+            errors = []
+
+            def reader(n: int):
+                count = 0
+                while not stop.is_set():
+                    a = conf.get("a")
+                    if not (a.x == a.y == a.z):
+                        errors.append((a.x, a.y, a.z))
+                    count += 1
+                reads[n] = count
+
+            def writer():
+                n = 0
+                while not stop.is_set():
+                    n += 1
+                    write(n)
+                    conf.reload()
+                    reloads[0] += 1
+
+            workers = [threading.Thread(target=reader, args=(n,)) for n in range(threads)]
+            workers.append(threading.Thread(target=writer))
+            for w in workers:
+                w.start()
+            time.sleep(DURATION)
+            stop.set()
+            for w in workers:
+                w.join()
+
+            report(f"reads with {threads} threads ({reloads[0]} reloads)", sum(reads) / DURATION)
+            if errors:
+                print(f"torn reads: {len(errors)}", file=sys.stderr)
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Measures reading environment variables in a large environment, with and
+without the process-wide cache of parsed variables.
+"""
+
+# standard lib
+import os
+
+# first party
+from benchmarks import measure, report
+from yacf import Configuration, Env
+from yacf.sources import _env_cache
+
+VARIABLES = 5_000
+MATCHING = 500
+
+
+def main():
+    for n in range(VARIABLES - MATCHING):
+        os.environ[f"OTHER_{n}"] = "x" * 40
+    for n in range(MATCHING):
+        os.environ[f"BENCH__S{n % 10}__K{n}"] = str(n)
+
+    env = Env("BENCH")
+
+    def uncached():
+        _env_cache.clear()
+        return env.read()
+
+    report(f"read {MATCHING} of {VARIABLES:,} variables, uncached", measure(uncached))
+    report(f"read {MATCHING} of {VARIABLES:,} variables, cached", measure(env.read))
+    report("load defaults and variables", measure(lambda: Configuration({"s0": {}}, env).load()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Measures loading configuration files with and without the file cache.
+"""
+
+# standard lib
+import json
+import os
+import tempfile
+
+# first party
+from benchmarks import dump_toml, generate, measure, report
+from yacf import Configuration
+from yacf.cache import file_cache
+
+
+def main():
+    with tempfile.TemporaryDirectory() as d:
+        for n_keys in [100, 10_000]:
+            data = generate(n_keys)
+            for ext, dumps in [("json", json.dumps), ("toml", dump_toml)]:
+                fp = os.path.join(d, f"conf_{n_keys}.{ext}")
+                with open(fp, "w") as f:
+                    f.write(dumps(data))
+
+                for maxsize in [0, 128]:
+                    file_cache.clear()
+                    file_cache.maxsize = maxsize
+                    name = "cached" if maxsize else "uncached"
+                    report(
+                        f"{name:<8} load {ext} ({n_keys:>6} keys)",
+                        measure(lambda: Configuration(fp).load()),
+                    )
+
+
+if __name__ == "__main__":
+    main()
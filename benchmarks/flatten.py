@@ -0,0 +1,23 @@
+"""
+Compares the former, recursive `add_dot_notations` with `flatten` on configs
+of different depth.
+"""
+
+# first party
+from benchmarks import generate, measure, report
+from yacf.utils import add_dot_notations, deep_update, flatten
+
+
+def main():
+    for n_keys in [1_000, 100_000]:
+        for fanout in [2, 10, 100]:
+            data = generate(n_keys, fanout=fanout)
+            name = f"({n_keys:>6} keys, fanout {fanout:>3})"
+
+            report(f"add_dot_notations {name}", measure(lambda: add_dot_notations(deep_update({}, data), ".")))
+            report(f"copy only         {name}", measure(lambda: deep_update({}, data)))
+            report(f"flatten           {name}", measure(lambda: flatten(data, ".")))
+
+
+if __name__ == "__main__":
+    main()
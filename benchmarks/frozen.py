@@ -0,0 +1,65 @@
+"""
+Compares attribute reads and the memory of a frozen configuration with the
+nested dictionaries of a configuration.
+"""
+
+# standard lib
+import copy
+import gc
+import os
+import tracemalloc
+
+# first party
+from benchmarks import generate, measure, report
+from yacf import Configuration
+from yacf.frozen import freeze
+
+
+def rss() -> int:
+    """Returns the resident set size of the process in bytes, Linux only."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def tenants(n: int) -> dict:
+    """Generates a map of tenants, each with keys of its own."""
+    return {"tenants": {f"t{i}": {f"a{i}": i, f"b{i}": i} for i in range(n)}}
+
+
+def memory(data: dict, name: str):
+    """Prints the memory of the data as dictionaries and frozen."""
+    for kind, build in [("dict", copy.deepcopy), ("frozen", freeze)]:
+        gc.collect()
+        before = rss()
+        tracemalloc.start()
+        obj = build(data)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"memory, {kind:<17}{name}: {size / 2**20:.1f} MiB allocated, "
+            f"RSS +{(rss() - before) / 2**20:.1f} MiB"
+        )
+        del obj
+
+
+def main():
+    for n_keys in [1_000, 100_000, 1_000_000]:
+        data = generate(n_keys)
+        cfg = Configuration(data).load()
+        frozen = cfg.freeze()
+        name = f"({n_keys:>9,} keys)"
+
+        report(f"attribute, configuration {name}", measure(lambda: cfg.k0.k0))
+        report(f"attribute, frozen        {name}", measure(lambda: frozen.k0.k0))
+        memory(data, name)
+
+    # sections with keys of their own do not get a class each
+    data = tenants(20_000)
+    frozen = freeze(data)
+    name = "(20,000 tenants)"
+    report(f"attribute, frozen tenant {name}", measure(lambda: frozen.tenants.t5.a5))
+    memory(data, name)
+
+
+if __name__ == "__main__":
+    main()
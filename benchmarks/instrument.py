@@ -0,0 +1,25 @@
+"""
+Measures the overhead of the lookup instrumentation, disabled and enabled.
+"""
+
+# first party
+from benchmarks import first_path, generate, measure, report
+from yacf import Configuration
+
+
+def main():
+    data = generate(10_000)
+    path = first_path(data)
+    cfg = Configuration(data, index=True).load()
+
+    report("get, never instrumented", measure(lambda: cfg.get(path)))
+    cfg.instrument(sample=100)
+    report("get, instrumented, every 100th sampled", measure(lambda: cfg.get(path)))
+    cfg.instrument(sample=1)
+    report("get, instrumented, all sampled", measure(lambda: cfg.get(path)))
+    cfg.instrument(False)
+    report("get, instrumentation disabled", measure(lambda: cfg.get(path)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Compares per-request overrides as pushed layers to building a merged
+configuration per request.
+"""
+
+# first party
+from benchmarks import first_path, generate, measure, report
+from yacf import Configuration
+
+
+def main():
+    data = generate(100_000)
+    path = first_path(data)
+    override = {path: "override"}
+
+    cfg = Configuration(data, index=True).load()
+
+    def merged():
+        Configuration(data, override).load().get(path)
+
+    def layered():
+        cfg.push(override)
+        cfg.get(path)
+        cfg.pop()
+
+    report("merged configuration per request", measure(merged))
+    report("push, get and pop per request", measure(layered))
+    report("get, no layers", measure(lambda: cfg.get(path)))
+    cfg.push(override)
+    report("get, one layer", measure(lambda: cfg.get(path)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Compares loading a large JSON file eagerly with the lazy, memory-mapped
+source, when only a few keys are read.
+"""
+
+# standard lib
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+# first party
+from benchmarks import generate
+from yacf import Configuration
+from yacf.cache import file_cache
+from yacf.sources import LazyJSON
+
+
+def main():
+    file_cache.maxsize = 0
+
+    with tempfile.TemporaryDirectory() as d:
+        fp = os.path.join(d, "tenants.json")
+        with open(fp, "w") as f:
+            json.dump({f"tenant_{n}": generate(1_000) for n in range(500)}, f)
+        size = os.path.getsize(fp) / 2**20
+
+        for name, source in [("eager", lambda: fp), ("lazy", lambda: LazyJSON(fp))]:
+
+            def run() -> float:
+                start = time.perf_counter()
+                conf = Configuration(source()).load()
+                loaded = time.perf_counter() - start
+                conf.get("tenant_42.k0.k0.k0")
+                conf.get("tenant_7.k1")
+                return loaded, time.perf_counter() - start
+
+            loaded, elapsed = run()
+
+            # tracing slows down loading, memory is measured separately
+            tracemalloc.start()
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(
+                f"{name:<5} {size:.1f} MiB file: load {loaded * 1000:>8.1f} ms, "
+                f"load + 2 lookups {elapsed * 1000:>8.1f} ms, {peak / 2**20:>7.1f} MiB peak"
+            )
+
+
+if __name__ == "__main__":
+    main()
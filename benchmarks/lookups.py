@@ -0,0 +1,27 @@
+"""
+Compares lookups in dot-notation with and without the flat key index,
+including lookups of missing keys.
+"""
+
+# first party
+from benchmarks import first_path, generate, measure, report
+from yacf import Configuration
+
+
+def main():
+    for n_keys in [100, 10_000, 100_000]:
+        data = generate(n_keys)
+        path = first_path(data)
+        head = path.split(".")[0]
+        plain = Configuration(data).load()
+        indexed = Configuration(data, index=True).load()
+
+        for name, conf in [("walk", plain), ("index", indexed)]:
+            report(f"{name:<5} get('{path}') ({n_keys:>7} keys)", measure(lambda: conf.get(path)))
+            report(f"{name:<5} get('missing') ({n_keys:>7} keys)", measure(lambda: conf.get(f"{head}.missing")))
+            report(f"{name:<5} attribute ({n_keys:>7} keys)", measure(lambda: conf.k0))
+            report(f"{name:<5} hasattr missing ({n_keys:>7} keys)", measure(lambda: hasattr(conf, "missing")))
+
+
+if __name__ == "__main__":
+    main()
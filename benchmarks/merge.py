@@ -0,0 +1,49 @@
+"""
+Compares `merge` with the former `deep_update` on layered configurations.
+"""
+
+# first party
+from benchmarks import generate, measure, report
+from yacf.utils import deep_update, merge
+
+
+def main():
+    base = generate(100_000)
+    layers = [{f"k{i}": {"k0": generate(1_000)}} for i in range(9)]
+    override = {"k0": {"k0": {"k0": {"k0": {"k0": -1}}}}}
+
+    def build_deep_update():
+        conf = {}
+        for layer in [base] + layers:
+            conf = deep_update(conf, layer)
+        return conf
+
+    def build_merge():
+        conf = {}
+        for layer in [base] + layers:
+            conf = merge(conf, layer)
+        return conf
+
+    report("build 10 layers, deep_update (100k keys)", measure(build_deep_update, 1.0))
+    report("build 10 layers, merge       (100k keys)", measure(build_merge, 1.0))
+
+    # deep_update modifies the config in place, merge creates a new snapshot
+    conf = build_merge()
+    copy = deep_update({}, conf)
+    report("single override, deep_update in place", measure(lambda: deep_update(copy, override)))
+    report("single override, merge into snapshot", measure(lambda: merge(conf, override)))
+
+    deep = leaf = {}
+    for _ in range(5_000):
+        leaf["x"] = {}
+        leaf = leaf["x"]
+    try:
+        deep_update({}, deep)
+        print("deep_update handles 5000 levels")
+    except RecursionError:
+        print("deep_update fails on 5000 levels with a RecursionError")
+    report("merge 5000 levels", measure(lambda: merge({}, deep)))
+
+
+if __name__ == "__main__":
+    main()
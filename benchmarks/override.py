@@ -0,0 +1,40 @@
+"""
+Measures context-local override scopes: entering and leaving a scope, and
+lookups with and without an active scope.
+"""
+
+# standard lib
+import threading
+
+# first party
+from benchmarks import first_path, generate, measure, report
+from yacf import Configuration
+
+
+def main():
+    data = generate(100_000)
+    path = first_path(data)
+    override = {path: "override"}
+
+    cfg = Configuration(data, index=True).load()
+
+    def scope():
+        with cfg.override(override):
+            cfg.get(path)
+
+    report("get, no scope", measure(lambda: cfg.get(path)))
+    report("enter scope, get and leave", measure(scope))
+
+    with cfg.override(override):
+        report("get, in scope", measure(lambda: cfg.get(path)))
+
+        # another thread reads the configuration, while the scope is active
+        results = []
+        thread = threading.Thread(target=lambda: results.append(measure(lambda: cfg.get(path))))
+        thread.start()
+        thread.join()
+        report("get, scope active in another thread", results[0])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Compares sequential and parallel parsing of many configuration fragments.
+
+The JSON parser and the TOML parser hold the global interpreter lock, hence
+threads mostly overlap the I/O. A process pool parses on several cores.
+"""
+
+# standard lib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+# first party
+from benchmarks import dump_toml, generate, measure, report
+from yacf import Configuration
+from yacf.cache import file_cache
+
+FRAGMENTS = 24
+
+
+def main():
+    file_cache.maxsize = 0
+
+    with tempfile.TemporaryDirectory() as d, ProcessPoolExecutor() as processes:
+        for ext, dumps in [("json", json.dumps), ("toml", dump_toml)]:
+            files = []
+            for n in range(FRAGMENTS):
+                fp = os.path.join(d, f"fragment_{n}.{ext}")
+                with open(fp, "w") as f:
+                    f.write(dumps({f"service_{n}": generate(2_000)}))
+                files.append(fp)
+
+            for name, parallel in [("sequential", None), ("threads", 8), ("processes", processes)]:
+                report(
+                    f"{FRAGMENTS} {ext} fragments, {name}",
+                    measure(lambda: Configuration(*files, parallel=parallel).load(), 1.0),
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Reports the parse time and the peak memory of each installed parser backend
+on large configuration files.
+"""
+
+# standard lib
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+# first party
+from benchmarks import dump_toml, generate
+from yacf import parsers
+
+SIZES = [10_000, 100_000]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as d:
+        for n_keys in SIZES:
+            data = generate(n_keys)
+            docs = {".json": json.dumps(data), ".toml": dump_toml(data)}
+
+            for ext, doc in docs.items():
+                fp = os.path.join(d, f"conf{ext}")
+                with open(fp, "w") as f:
+                    f.write(doc)
+                size = os.path.getsize(fp) / 2**20
+
+                for parser in parsers.available(ext):
+
+                    def parse():
+                        with open(fp, "rb" if parser.binary else "r") as f:
+                            parser.parse(f.read())
+
+                    start = time.perf_counter()
+                    parse()
+                    elapsed = time.perf_counter() - start
+
+                    # tracing slows down parsing, memory is measured separately
+                    tracemalloc.start()
+                    parse()
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+
+                    print(
+                        f"{ext[1:]:<4} {size:>6.1f} MiB {parser.name:<8} "
+                        f"{elapsed * 1000:>10.1f} ms {peak / 2**20:>10.1f} MiB peak"
+                    )
+
+
+if __name__ == "__main__":
+    main()
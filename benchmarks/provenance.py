@@ -0,0 +1,29 @@
+"""
+Measures the cost of recording provenance while loading layered
+configurations, and shows that lookups do not pay for it.
+"""
+
+# first party
+from benchmarks import first_path, generate, measure, report
+from yacf import Configuration
+
+
+def main():
+    base = generate(100_000)
+    layers = [{f"k{i}": {"k0": generate(1_000)}} for i in range(9)]
+    key = first_path(base)
+
+    for provenance in [False, True]:
+        name = f"provenance={provenance}"
+        report(
+            f"load 10 layers, {name} (100k keys)",
+            measure(lambda: Configuration(base, *layers, provenance=provenance).load(), 1.0),
+        )
+        cfg = Configuration(base, *layers, provenance=provenance).load()
+        report(f"get, {name}", measure(lambda: cfg.get(key)))
+
+    report("explain", measure(lambda: cfg.explain(key)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Measures the validation of a configuration with 50k keys against a schema,
+and compares reading converted values with converting on every read.
+"""
+
+# first party
+from benchmarks import first_path, generate, measure, report
+from yacf import Configuration
+from yacf.schema import Schema, to_duration
+from yacf.utils import flatten, unflatten
+
+N_KEYS = 50_000
+
+
+def main():
+    conf = generate(N_KEYS)
+    leaves = [k for k, v in flatten(conf, ".").items() if not isinstance(v, dict)]
+    # half of the values are strings, which need to be converted
+    strings = unflatten({k: f"{conf_val}s" for k, conf_val in _values(conf, leaves[::2])}, ".")
+    spec = unflatten({k: "duration" for k in leaves}, ".")
+    schema = Schema(spec)
+
+    report(f"compile schema ({N_KEYS // 1000}k keys)", measure(lambda: Schema(spec)))
+    report(f"validate ({N_KEYS // 1000}k keys)", measure(lambda: schema.validate(conf)))
+    report(
+        f"load without schema ({N_KEYS // 1000}k keys)",
+        measure(lambda: Configuration(conf, strings).load()),
+    )
+    report(
+        f"load with schema ({N_KEYS // 1000}k keys)",
+        measure(lambda: Configuration(conf, strings, schema=schema).load()),
+    )
+
+    key = first_path(conf)
+    plain = Configuration(conf, strings, index=True).load()
+    typed = Configuration(conf, strings, index=True, schema=spec).load()
+    report("get and convert on every read", measure(lambda: to_duration(plain.get(key))))
+    report("get converted value", measure(lambda: typed.get(key)))
+
+
+def _values(conf: dict, keys: list):
+    flat = flatten(conf, ".")
+    for k in keys:
+        yield k, flat[k]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Compares the access to sections via `Section` views with the former approach,
+which re-merged a new `Configuration` for every accessed section.
+"""
+
+# first party
+from benchmarks import generate, measure, report
+from yacf import Configuration
+
+
+def main():
+    for n_keys in [100, 10_000, 100_000]:
+        # One large section "api" holding all keys
+        conf = Configuration({"api": generate(n_keys)}).load()
+        section = conf._conf["api"]
+
+        def copy():
+            # Behaviour before section views were introduced
+            return Configuration(section).load()
+
+        def view():
+            return conf.get("api")
+
+        def attribute():
+            return conf.api.k0
+
+        report(f"copy section      ({n_keys:>7} keys)", measure(copy))
+        report(f"view section      ({n_keys:>7} keys)", measure(view))
+        report(f"attribute access  ({n_keys:>7} keys)", measure(attribute))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+Measures the cost of setting values on configurations of growing size, with
+and without the flat index.
+"""
+
+# first party
+from benchmarks import first_path, generate, measure, report
+from yacf import Configuration
+
+
+def main():
+    for n_keys in [1_000, 100_000]:
+        for index in [False, True]:
+            cfg = Configuration(generate(n_keys), index=index).load()
+            key = first_path(cfg._conf)
+            name = f"{n_keys:,} keys, index={index}"
+
+            report(f"set, {name}", measure(lambda: cfg.set(key, 1)))
+
+            def batch():
+                with cfg.batch() as b:
+                    for n in range(100):
+                        b.set(f"{key}{n}", n)
+
+            report(f"batch of 100, {name}", measure(batch) * 100)
+            report(f"get after set, {name}", measure(lambda: cfg.get(key)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Compares the cold start of a configuration from its files with the restore
+from a binary snapshot.
+"""
+
+# standard lib
+import json
+import os
+import tempfile
+
+# first party
+from benchmarks import dump_toml, generate, measure, report
+from yacf import Configuration
+from yacf.cache import file_cache
+
+
+def main():
+    file_cache.maxsize = 0
+
+    with tempfile.TemporaryDirectory() as d:
+        for n_keys in [1_000, 100_000]:
+            files = []
+            for n, (ext, dumps) in enumerate([("toml", dump_toml), ("json", json.dumps)] * 2):
+                fp = os.path.join(d, f"layer_{n_keys}_{n}.{ext}")
+                with open(fp, "w") as f:
+                    f.write(dumps(generate(n_keys // (n + 1))))
+                files.append(fp)
+
+            snapshot = os.path.join(d, f"conf_{n_keys}.snapshot")
+            Configuration(*files).load().compile(snapshot)
+
+            report(f"load 4 files   ({n_keys:>6} keys)", measure(lambda: Configuration(*files).load(), 1.0))
+            report(
+                f"load snapshot  ({n_keys:>6} keys)",
+                measure(lambda: Configuration(*files, snapshot=snapshot).load(), 1.0),
+            )
+
+
+if __name__ == "__main__":
+    main()
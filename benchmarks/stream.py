@@ -0,0 +1,45 @@
+"""
+Measures the throughput and the peak memory of streaming records in JSON lines
+format into a configuration.
+"""
+
+# standard lib
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+# first party
+from yacf import Configuration
+
+RECORDS = 300_000
+TENANTS = 10_000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as d:
+        fp = os.path.join(d, "overrides.jsonl")
+        with open(fp, "w") as f:
+            for n in range(RECORDS):
+                f.write(json.dumps({f"tenants.t{n % TENANTS}.limits.l{n % 7}": n}) + "\n")
+        size = os.path.getsize(fp) / 2**20
+
+        start = time.perf_counter()
+        Configuration({}).load().stream(fp)
+        elapsed = time.perf_counter() - start
+
+        # tracing slows down streaming, memory is measured separately
+        tracemalloc.start()
+        Configuration({}).load().stream(fp)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            f"{RECORDS:,} records ({size:.1f} MiB, {TENANTS:,} tenants): "
+            f"{RECORDS / elapsed:,.0f} records/s, {peak / 2**20:.1f} MiB peak"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Runs the benchmarks of the hot paths across configurations of different
+sizes and shapes, and writes the results as JSON. Results of different
+releases can be compared to find regressions.
+
+    $ python -m benchmarks.suite --output results.json
+    $ python -m benchmarks.suite --sizes 10 1000 --min-time 0.1
+    $ python -m benchmarks.suite --compare results.json
+    $ python -m benchmarks.suite --sizes 100000 --profile get.dotted
+
+Each result holds the name of the benchmark, the number of keys, the shape of
+the configuration, the operations per second and the peak of the allocated
+memory of a single operation in bytes.
+"""
+
+# standard lib
+import argparse
+import cProfile
+import json
+import os
+import platform
+import pstats
+import sys
+import tempfile
+from typing import Callable, Iterator, Tuple
+
+# first party
+from benchmarks import dump_toml, first_path, generate, measure, peak_memory
+from yacf import Configuration, version
+from yacf.cache import file_cache
+from yacf.configuration import _readf
+from yacf.utils import deep_update
+
+SIZES = [10, 1_000, 100_000, 1_000_000]
+LAYERS = 10
+
+# fanout of the generated sections, per shape
+SHAPES = {"shallow": 1_000, "deep": 4}
+
+# TOML is parsed in pure Python, larger files take minutes
+MAX_TOML_KEYS = 100_000
+
+
+def cases(n_keys: int, shape: str, tmp: str) -> Iterator[Tuple[str, Callable]]:
+    """Generates the benchmarks for a configuration of the given size and
+    shape.
+
+    :param n_keys: Number of keys of the configuration
+    :param shape: Shape of the configuration, see `SHAPES`
+    :param tmp: Directory to write the files to
+    :return: iterator of the names and functions of the benchmarks
+    """
+    fanout = SHAPES[shape]
+    data = generate(n_keys, fanout)
+    layers = [generate(max(n_keys // LAYERS, 1), fanout) for _ in range(LAYERS)]
+    path = first_path(data)
+    head = path.split(".")[0]
+
+    yield "load", lambda: Configuration(data).load()
+    yield "load.layers", lambda: Configuration(*layers).load()
+    yield "load.index", lambda: Configuration(data, index=True).load()
+
+    def update():
+        conf = {}
+        for layer in layers:
+            conf = deep_update(conf, layer)
+
+    yield "deep_update.layers", update
+
+    plain = Configuration(data).load()
+    indexed = Configuration(data, index=True).load()
+    yield "get.flat", lambda: plain.get(head)
+    yield "get.dotted", lambda: plain.get(path)
+    yield "get.dotted.index", lambda: indexed.get(path)
+    yield "get.attribute", lambda: getattr(plain, head)
+    yield "dict", plain.dict
+    yield "dict.index", indexed.dict
+
+    for ext, dumps in [("json", json.dumps), ("toml", dump_toml)]:
+        if ext == "toml" and n_keys > MAX_TOML_KEYS:
+            continue
+        fp = os.path.join(tmp, f"{shape}_{n_keys}.{ext}")
+        with open(fp, "w") as f:
+            f.write(dumps(data))
+        yield f"_readf.{ext}", lambda fp=fp: _readf(fp)
+
+
+def run(sizes: list, min_time: float) -> Iterator[dict]:
+    """Runs all benchmarks.
+
+    :param sizes: Numbers of keys of the configurations
+    :param min_time: Minimum runtime of a single benchmark in seconds
+    :return: iterator of the results
+    """
+    file_cache.maxsize = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_keys in sizes:
+            for shape in SHAPES:
+                for name, fn in cases(n_keys, shape, tmp):
+                    yield {
+                        "name": name,
+                        "keys": n_keys,
+                        "shape": shape,
+                        "ops_per_s": measure(fn, min_time),
+                        "peak_bytes": peak_memory(fn),
+                    }
+
+
+def profile(sizes: list, name: str):
+    """Profiles a single benchmark and prints the functions, which take the
+    most time.
+
+    :param sizes: Numbers of keys of the configurations
+    :param name: Name of the benchmark to profile
+    """
+    file_cache.maxsize = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_keys in sizes:
+            for shape in SHAPES:
+                for case, fn in cases(n_keys, shape, tmp):
+                    if case != name:
+                        continue
+                    print(f"{name}, {shape}, {n_keys:,} keys", file=sys.stderr)
+                    profiler = cProfile.Profile()
+                    profiler.runcall(measure, fn)
+                    pstats.Stats(profiler, stream=sys.stderr).sort_stats("tottime").print_stats(15)
+
+
+def compare(results: list, file_path: str):
+    """Prints the change of the operations per second compared to previous
+    results.
+
+    :param results: Results of this run
+    :param file_path: Path of the JSON file with the previous results
+    """
+    with open(file_path) as f:
+        previous = {(r["name"], r["keys"], r["shape"]): r for r in json.load(f)["results"]}
+
+    for result in results:
+        old = previous.get((result["name"], result["keys"], result["shape"]))
+        if old is None:
+            continue
+        change = result["ops_per_s"] / old["ops_per_s"] - 1
+        print(
+            f"{result['name']:<20} {result['shape']:<8} {result['keys']:>9,} keys "
+            f"{change:>+8.1%} ops/s",
+            file=sys.stderr,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="numbers of keys")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per benchmark")
+    parser.add_argument("--output", help="file to write the JSON results to, default stdout")
+    parser.add_argument("--compare", help="JSON file of previous results to compare with")
+    parser.add_argument("--profile", metavar="NAME", help="profile a single benchmark instead")
+    args = parser.parse_args()
+
+    if args.profile:
+        profile(args.sizes, args.profile)
+        return
+
+    results = []
+    for result in run(args.sizes, args.min_time):
+        results.append(result)
+        print(
+            f"{result['name']:<20} {result['shape']:<8} {result['keys']:>9,} keys "
+            f"{result['ops_per_s']:>15,.1f} ops/s {result['peak_bytes'] / 2**20:>9.2f} MiB",
+            file=sys.stderr,
+        )
+
+    report = {
+        "yacf": version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.compare:
+        compare(results, args.compare)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -115,7 +115,11 @@ def publish():
 #
 
 
-INSTALL_REQUIRES = ["toml"]
+INSTALL_REQUIRES = ['tomli; python_version < "3.11"']
+EXTRAS_REQUIRE = {
+    # faster parser backends, used automatically if installed
+    "fast": ["orjson"],
+}
 PACKAGES = setuptools.find_packages()
 
 
@@ -145,8 +149,9 @@ def main(args):
         maintainer="Max Resing",
         maintainer_email="max.resing@protonmail.com",
         url="https://github.com/resingm/yacf",
-        python_requires=">=3.6",
+        python_requires=">=3.7",
         install_requires=INSTALL_REQUIRES,
+        extras_require=EXTRAS_REQUIRE,
         packages=PACKAGES,
         classifiers=CLASSIFIERS,
         project_urls={
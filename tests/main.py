@@ -6,11 +6,26 @@ implemented one integration test.
 """
 
 # standard lib
+import asyncio
+import dataclasses
+import gc
+import json
+import os
+import tempfile
+import threading
 import traceback
-from typing import Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Union
 
 # first party
-from yacf import Configuration
+from yacf import Configuration, Layered, Section
+from yacf import frozen as frozen_mod
+from yacf import parsers
+from yacf.cache import file_cache
+from yacf.configuration import _readf
+from yacf.sources import Argv, Env, LazyJSON
+from yacf.utils import flatten, merge
+from yacf.watcher import Watcher
 
 _default = {
     "a": {
@@ -20,6 +35,7 @@ _default = {
         "int_2": -1,
         "bool_0": False,
         "bool_1": True,
+        "none": None,
     },
     "b": {
         "int_arr": [0, 1, 2],
@@ -146,6 +162,822 @@ def assert_dict(cfg: Configuration):
     assert_section_b(d)
     assert_section_c(d)
 
+    # the configuration is not modified, the lazy view has the same keys
+    assert cfg.dict() == d
+    lazy = cfg.dict(lazy=True)
+    assert set(lazy) == set(d) and len(lazy) == len(d)
+    assert all(lazy[k] == v for k, v in d.items()) and dict(lazy) == d
+
+    # TOML has no null values
+    if "a.none" in d:
+        assert d["a.none"] is None and "a.none" in lazy and lazy["a.none"] is None
+
+
+def assert_sections(cfg: Configuration):
+    # sections are views, sharing the storage of the configuration
+    a = cfg.get("a")
+    assert isinstance(a, Section)
+    assert a.dict() == cfg.get("a").dict()
+    assert isinstance(cfg.c.c_a, Section)
+    assert cfg.get("c").get("c_a").parent == cfg.c.c_a.parent
+
+    # keys stored as None exist, TOML has no null values though
+    expected = {k: v for k, v in _default.get("a").items() if v is not None or "none" in a}
+    assert dict(a) == expected and "string_0" in a and len(a) == len(expected)
+    if "none" in a:
+        assert a["none"] is None and a.none is None and a.get("none", 1) == 1
+
+
+def assert_incremental_load():
+    for index in [False, True]:
+        cfg = Configuration(_default, index=index).load()
+        cfg.load({"a": {"int_0": 42}, "b": "replaced", "d": {"new": True}})
+
+        assert cfg.get("a.int_0") == 42
+        assert cfg.a.string_0 == _default.get("a").get("string_0")
+        assert cfg.get("b") == "replaced"
+        assert cfg.get("b.int_arr") is None
+        assert cfg.d.new is True
+        assert_section_c(cfg)
+
+        # Inputs which are already merged, are not merged again
+        cfg._input[0] = {"a": {"int_0": -42}}
+        cfg.load()
+        assert cfg.get("a.int_0") == 42
+
+
+def assert_snapshots():
+    cfg = Configuration(_default, index=True).load()
+    section = cfg.get("a")
+    conf = cfg._conf
+    cfg.load({"a": {"int_0": 7}})
+
+    # published snapshots are never modified
+    assert section.int_0 == 0 and cfg.a.int_0 == 7
+    assert conf == _default and conf is not cfg._conf
+    assert conf.get("c") is cfg._conf.get("c")
+    assert cfg.dict() == cfg.dict()
+
+
+def assert_merge():
+    override = {"a": {"int_0": 5, "int_1": 1}, "b": {"int_arr": [3]}, "d": {"e": {}}}
+    merged = merge(_default, override)
+
+    assert merged.get("a").get("int_0") == 5 and _default.get("a").get("int_0") == 0
+    assert merged.get("b").get("int_arr") == [3]
+    assert merged.get("b").get("int_arr") is not override.get("b").get("int_arr")
+    assert merged.get("d") == {"e": {}} and merged.get("d") is not override.get("d")
+    # unchanged sections are shared, unchanged configs are returned as is
+    assert merged.get("c") is _default.get("c")
+    assert merge(_default, {"a": {"int_1": 1}}) is _default
+
+    # the depth is not limited by the recursion limit
+    deep = leaf = {}
+    for _ in range(10_000):
+        leaf["x"] = {}
+        leaf = leaf["x"]
+    leaf["value"] = 1
+    merged = merge({}, deep)
+    for _ in range(10_000):
+        assert merged is not deep
+        merged, deep = merged["x"], deep["x"]
+    assert merged == {"value": 1}
+
+
+def assert_parallel():
+    inputs = ["data/json.json", {"a": {"int_0": 1}}, "data/toml.toml", {"b": {"x": 0}}]
+    sequential = Configuration(*inputs).load()
+
+    with ProcessPoolExecutor(2) as executor:
+        for parallel in [4, executor]:
+            cfg = Configuration(*inputs, parallel=parallel).load()
+            assert cfg._conf == sequential._conf
+            assert cfg._layers == sequential._layers
+
+
+def assert_aload():
+    async def sidecar() -> dict:
+        await asyncio.sleep(0)
+        return {"a": {"int_0": 2}, "b": {"x": 0}}
+
+    async def load() -> Configuration:
+        cfg = Configuration("data/json.json", sidecar())
+        return await cfg.aload(sidecar, {"b": {"x": 1}}, concurrency=2)
+
+    cfg = asyncio.run(load())
+    assert cfg.a.int_0 == 2 and cfg.b.x == 1
+    assert_section_c(cfg)
+
+    # a failed input is not kept, the configuration can still be loaded
+    async def failing() -> dict:
+        raise ConnectionError("unavailable")
+
+    async def retry(cfg: Configuration) -> Configuration:
+        try:
+            await cfg.aload(failing, sidecar())
+            assert False, "Failed input was loaded"
+        except ConnectionError:
+            pass
+        return await cfg.aload(sidecar())
+
+    cfg = asyncio.run(retry(Configuration({"b": {"x": 1}}).load()))
+    assert len(cfg._input) == 2 and cfg.a.int_0 == 2 and cfg.b.x == 0
+    assert cfg.load({"b": {"x": 3}}).b.x == 3
+
+    # loading does not block the event loop, while a reload holds the lock
+    async def blocked() -> list:
+        cfg = Configuration({"b": {"x": 1}}).load()
+        ticks = []
+
+        async def tick():
+            for n in range(3):
+                ticks.append(n)
+                await asyncio.sleep(0.01)
+
+        with cfg._lock:
+            task = asyncio.ensure_future(cfg.aload({"b": {"x": 2}}))
+            await tick()
+        await task
+        return ticks + [cfg.b.x]
+
+    assert asyncio.run(blocked()) == [0, 1, 2, 2]
+
+
+def assert_parsers():
+    selected = dict(parsers.PARSERS)
+    try:
+        for ext in [".json", ".toml"]:
+            for parser in parsers.available(ext):
+                file_cache.clear()
+                parsers.select(ext, parser.name)
+                cfg = Configuration(f"data/{ext[1:]}{ext}").load()
+                assert_section_a(cfg)
+                assert_section_b(cfg)
+                assert_section_c(cfg)
+
+        # plain loaders, which read a file object, are supported as well
+        with tempfile.TemporaryDirectory() as d:
+            fp = os.path.join(d, "conf.cfg")
+            with open(fp, "w") as f:
+                json.dump({"a": {"x": 1}}, f)
+            parsers.PARSERS[".cfg"] = json.load
+            assert Configuration(fp).load().a.x == 1
+            parsers.PARSERS[".json"] = json.load
+            file_cache.clear()
+            assert_section_a(Configuration("data/json.json").load())
+    finally:
+        parsers.PARSERS.pop(".cfg", None)
+        parsers.PARSERS.update(selected)
+        file_cache.clear()
+
+
+def assert_snapshot():
+    with tempfile.TemporaryDirectory() as d:
+        fp = os.path.join(d, "conf.json")
+        snapshot = os.path.join(d, "conf.snapshot")
+        with open(fp, "w") as f:
+            json.dump({"a": {"x": 0}}, f)
+
+        inputs = [_default, "data/toml.toml", fp]
+        cfg = Configuration(*inputs, snapshot=snapshot).load()
+        assert os.path.exists(snapshot)
+
+        # restored from the snapshot, without reading the inputs
+        restored = Configuration(*inputs, snapshot=snapshot).load()
+        assert restored._layers == [None] * 3
+        assert restored._conf == cfg._conf
+        assert restored.a.x == 0
+
+        with open(fp, "w") as f:
+            json.dump({"a": {"x": 10}}, f)
+        assert restored.reload() == ["a.x"]
+        assert restored._conf == Configuration(*inputs).load()._conf
+
+        # outdated snapshots are not used
+        outdated = Configuration(*inputs, snapshot=snapshot).load()
+        assert outdated._layers[0] is not None and outdated.a.x == 10
+
+        # values set on the configuration are not compiled
+        outdated.set("a.x", 20)
+        try:
+            outdated.compile()
+            assert False, "Compiled a configuration with values set"
+        except ValueError:
+            pass
+
+
+def assert_lazy_json():
+    for index in [False, True]:
+        lazy = LazyJSON("data/json.json")
+        cfg = Configuration({"a": {"int_0": 5, "x": 1}}, lazy, {"c": {"c_a": {"parent": "x"}}}, index=index)
+        cfg.load()
+
+        # sections are parsed on first access only
+        assert lazy._sections == {}
+        assert cfg.a.x == 1
+        assert_section_a(cfg)
+        assert list(lazy._sections) == ["a"]
+
+        assert cfg.get("c.c_a.parent") == "x"
+        assert cfg.c.c_b.parent == "c"
+        assert_section_b(cfg)
+        assert cfg.dict()["c.c_a.parent"] == "x"
+
+        # the mapping is released, once all sections are merged
+        assert lazy._mm is None and cfg.get("b.int_arr") is not None
+
+    with tempfile.TemporaryDirectory() as d:
+        fp = os.path.join(d, "escaped.json")
+        with open(fp, "w") as f:
+            json.dump({"a": {"k": '\\"}', "l": [1, "]"]}, "b": 1}, f)
+        with LazyJSON(fp) as lazy:
+            assert lazy["a"] == {"k": '\\"}', "l": [1, "]"]} and lazy["b"] == 1
+
+        # a truncated document fails right away
+        with open(fp, "wb") as f:
+            f.write(b'{"a": {"k": "\\\\", ' + b"x" * 64)
+        try:
+            LazyJSON(fp).read()
+            assert False, "Indexed a truncated document"
+        except ValueError:
+            pass
+
+    with LazyJSON("data/json.json") as lazy:
+        assert lazy["a"]["int_0"] == 0
+    assert lazy._mm is None and lazy["a"]["int_0"] == 0 and "b" in lazy
+    try:
+        lazy["b"]
+        assert False, "Parsed a section of a closed source"
+    except ValueError:
+        pass
+
+
+def assert_stream():
+    with tempfile.TemporaryDirectory() as d:
+        fp = os.path.join(d, "overrides.jsonl")
+        with open(fp, "w") as f:
+            for n in range(25):
+                f.write(json.dumps({f"tenants.t{n % 10}.limit": n}) + "\n")
+            f.write("\n")
+            f.write(json.dumps({"a.int_0": 100, "b": "replaced"}) + "\n")
+
+        for index in [False, True]:
+            cfg = Configuration("data/json.json", index=index).load()
+            cfg.stream(fp, chunk_size=7)
+            cfg.stream([{"a.int_1": 101}, {"c.c_a.parent": "p"}])
+
+            assert cfg.get("tenants.t4.limit") == 24 and cfg.tenants.t9.limit == 19
+            assert cfg.a.int_0 == 100 and cfg.a.int_1 == 101 and cfg.a.string_0 == "test"
+            assert cfg.get("b") == "replaced" and cfg.get("b.int_arr") is None
+            assert cfg.c.c_a.parent == "p" and cfg.c.c_b.parent == "c"
+            assert len(cfg._layers) == 2
+
+            # streamed records stay on top of a reloaded configuration
+            cfg._stamps.clear()
+            assert cfg.reload() == []
+            assert cfg.a.int_0 == 100 and cfg.get("tenants.t4.limit") == 24
+
+        # the result does not depend on the chunk size
+        records = [{"a": 5}, {"a.b": 1}, {"c.c_a": None}, {"c.c_a": {"x": 2}}, {"c.c_b.y": 3}]
+        for chunk_size in [1, 2, 10_000]:
+            cfg = Configuration("data/json.json").load().stream(records, chunk_size=chunk_size)
+            assert cfg.get("a") == {"b": 1} and cfg.get("c.c_a") == {"x": 2}
+            assert cfg.get("c.c_b") == {"parent": "c", "section": "b", "y": 3}
+
+
+def assert_env():
+    env = {
+        "YACF_TEST__A__INT_0": "10",
+        "YACF_TEST__A__FLOAT_0": "2.5",
+        "YACF_TEST__A__BOOL_0": "False",
+        "YACF_TEST__B__INT_ARR": "[4, 5]",
+        "YACF_TEST__API__HOSTNAME": "localhost",
+        "YACF_TEST__FILES__MODE": "0644",
+        "YACF_TEST__FILES__TAG": "2024_",
+        "YACF_TEST": "ignored",
+        "YACF_TESTS__A__INT_1": "ignored",
+    }
+    os.environ.update(env)
+    try:
+        cfg = Configuration("data/json.json", Env("YACF_TEST")).load()
+        assert cfg.a.int_0 == 10 and cfg.a.float_0 == 2.5 and cfg.a.bool_0 is False
+        assert cfg.a.int_1 == 1 and cfg.b.int_arr == [4, 5] and cfg.api.hostname == "localhost"
+        assert cfg.files.mode == "0644" and cfg.files.tag == "2024_"
+
+        # unchanged variables are not parsed again
+        content = Env("YACF_TEST").read()
+        assert Env("YACF_TEST").read() is content
+        os.environ["YACF_TEST__API__PORT"] = "8080"
+        assert Env("YACF_TEST").read()["api"] == {"hostname": "localhost", "port": 8080}
+
+        with tempfile.TemporaryDirectory() as d:
+            fp = os.path.join(d, "config.snapshot")
+            Configuration("data/json.json", Env("YACF_TEST"), snapshot=fp).load()
+            assert os.path.exists(fp)
+    finally:
+        for k in list(env) + ["YACF_TEST__API__PORT"]:
+            os.environ.pop(k, None)
+
+
+def assert_argv():
+    args = [
+        "prog",
+        "--a.int_0=10",
+        "--a.string_0",
+        "123",
+        "--a.bool_0",
+        "--a.bool_1=off",
+        "--b.int_arr=3,4",
+        "--b.string_arr=[\"x\"]",
+        "--api.port=8080",
+        "--api.debug",
+        "--",
+        "--a.int_1=5",
+    ]
+    cfg = Configuration("data/json.json", Argv(args[1:])).load()
+    assert cfg.a.int_0 == 10 and cfg.a.string_0 == "123" and cfg.a.int_1 == 1
+    assert cfg.a.bool_0 is True and cfg.a.bool_1 is False
+    assert cfg.b.int_arr == [3, 4] and cfg.b.string_arr == ["x"]
+    assert cfg.api.port == 8080 and cfg.api.debug is True
+
+    # values, which only look like numbers, stay strings
+    cfg = Configuration(Argv(["--tag=1_", "--mode=0644", "--build=1_.5"])).load()
+    assert cfg.tag == "1_" and cfg.mode == "0644" and cfg.build == "1_.5"
+
+    # values are converted with the defaults of the inputs loaded before
+    cfg = Configuration({"api": {"port": 1.0}}).load(Argv(["--api.port", "8080"]))
+    assert cfg.api.port == 8080.0 and isinstance(cfg.api.port, float)
+    cfg._stamps.clear()
+    cfg.reload()
+    assert cfg.api.port == 8080.0
+
+    try:
+        Configuration("data/json.json", Argv(["--a.int_0=zero"])).load()
+        assert False, "Invalid argument was converted"
+    except ValueError:
+        pass
+
+
+def assert_schema():
+    @dataclasses.dataclass
+    class Timeouts:
+        read: float = dataclasses.field(default=30.0, metadata={"convert": "duration"})
+        body: int = dataclasses.field(default=0, metadata={"convert": "bytesize"})
+
+    @dataclasses.dataclass
+    class A:
+        string_0: str
+        int_0: int
+        bool_0: bool
+        timeouts: Timeouts
+        int_3: Optional[int] = None
+
+    spec = {"a": A, "b": {"int_arr": List[float], "extra": (str, "x")}}
+    for schema in [spec, {"a": {"int_0": int, "timeouts": {"read": ("duration", 30.0)}}}]:
+        for index in [False, True]:
+            cfg = Configuration("data/json.json", index=index, schema=schema).load()
+            assert cfg.a.int_0 == 0 and cfg.get("a.timeouts.read") == 30.0
+
+            cfg.set("a.int_0", "8080")
+            cfg.set("a.timeouts.read", "1m30s")
+            assert cfg.get("a.int_0") == 8080 and cfg.a.timeouts.read == 90.0
+
+    cfg = Configuration("data/json.json", schema=spec).load()
+    assert cfg.b.int_arr == [0.0, 1.0, 2.0] and isinstance(cfg.b.int_arr[0], float)
+    assert cfg.b.extra == "x" and cfg.get("a.int_3") is None and cfg.a.timeouts.body == 0
+    cfg.set("a.timeouts.body", "1.5KiB")
+    cfg.set("a.bool_0", "yes")
+    assert cfg.a.timeouts.body == 1536 and cfg.a.bool_0 is True
+
+    for key, val in [("a.int_0", "zero"), ("a.bool_0", "maybe"), ("a.timeouts.read", "1y")]:
+        try:
+            cfg.set(key, val)
+            assert False, f"Invalid value of {key} was accepted"
+        except ValueError:
+            pass
+    assert cfg.a.int_0 == 0 and cfg.a.bool_0 is True
+    assert cfg._layers[-1] == {"a": {"timeouts": {"body": "1.5KiB"}, "bool_0": "yes"}}
+
+    try:
+        Configuration({"a": {"int_0": 1}}, schema=spec).load()
+        assert False, "Missing key was accepted"
+    except ValueError:
+        pass
+
+
+def assert_freeze():
+    cfg = Configuration("data/json.json", {"d": {"with-dash": {"x": 1}, "items": [{"y": 2}]}}).load()
+    frozen = cfg.freeze()
+    assert frozen.a.int_0 == 0 and frozen.a.string_0 == "test" and frozen.c.c_a.parent == "c"
+    assert frozen.b.int_arr == (0, 1, 2) and frozen.d["with-dash"].x == 1
+    assert frozen.d["items"][0].y == 2 and len(frozen.c.empty) == 0
+    assert frozen["a"]["int_1"] == 1 and "a" in frozen and list(frozen) == ["a", "b", "c", "d"]
+    assert type(frozen.c.c_a) is type(frozen.c.c_b)
+    assert cfg.freeze() is frozen
+
+    for modify in [lambda: setattr(frozen.a, "int_0", 1), lambda: delattr(frozen, "a")]:
+        try:
+            modify()
+            assert False, "Frozen configuration was modified"
+        except AttributeError:
+            pass
+
+    cfg.set("a.int_0", 5)
+    assert cfg.freeze().a.int_0 == 5 and frozen.a.int_0 == 0
+
+    # sections with keys of their own share a class beyond the limits
+    n = frozen_mod.MAX_UNIQUE_SLOTS + 1
+    tenants = frozen_mod.freeze({"t": {f"t{i}": {f"a{i}": i} for i in range(n)}})
+    assert type(tenants.t) is frozen_mod.FrozenSection and tenants.t.t99.a99 == 99
+    classes = {type(tenants.t[k]) for k in tenants.t} - {frozen_mod.FrozenSection}
+    assert len(classes) == frozen_mod.MAX_UNIQUE_CLASSES - 1
+    assert ("a0",) in frozen_mod._classes
+    del tenants, classes
+    gc.collect()
+    assert ("a0",) not in frozen_mod._classes
+
+
+def assert_provenance():
+    defaults = {"a": {"int_0": -1, "extra": 1}}
+    argv = Argv(["--a.int_0=7"])
+    cfg = Configuration(defaults, "data/json.json", argv, provenance=True).load()
+
+    assert cfg.explain("a.int_0") == [(defaults, -1), ("data/json.json", 0), (argv, 7)]
+    assert cfg.explain("a.extra") == [(defaults, 1)]
+    assert cfg.explain("b.int_arr") == [("data/json.json", [0, 1, 2])]
+    assert [s for s, _ in cfg.explain("a")] == [defaults, "data/json.json", argv]
+    assert cfg.explain("a.missing") == []
+
+    # the values are copies, the inputs and the file cache are not modified
+    cfg.explain("b.int_arr")[-1][1].append(99)
+    cfg.explain("a")[0][1]["extra"] = 2
+    assert cfg.explain("b.int_arr") == [("data/json.json", [0, 1, 2])]
+    assert Configuration("data/json.json").load().b.int_arr == [0, 1, 2]
+    assert defaults["a"]["extra"] == 1
+
+    cfg.set("a.extra", 2)
+    cfg.set("a.extra", 3)
+    assert cfg.explain("a.extra") == [(defaults, 1), ("set", 3)]
+
+    cfg._stamps.clear()
+    cfg.reload()
+    assert cfg.explain("a.int_0")[-1] == (argv, 7)
+    assert cfg.explain("a.extra") == [(defaults, 1), ("set", 3)]
+
+    # a value, which replaced a parent section, hides the inputs before it
+    layers = [{"a": {"y": 1}}, {"a": 5}, {"a": {"y": 2}}]
+    cfg = Configuration(*layers, provenance=True).load()
+    assert cfg.explain("a.y") == [(layers[2], 2)] and cfg.explain("a") == [(layers[2], {"y": 2})]
+    cfg = Configuration(*layers[:2], provenance=True).load()
+    assert cfg.explain("a") == [(layers[0], {"y": 1}), (layers[1], 5)]
+
+    try:
+        Configuration(defaults).load().explain("a.int_0")
+        assert False, "Provenance was not enabled"
+    except ValueError:
+        pass
+
+
+def assert_instrument():
+    cfg = Configuration("data/json.json").load()
+    try:
+        cfg.lookup_stats()
+        assert False, "Lookups are not instrumented"
+    except ValueError:
+        pass
+
+    cfg.instrument(sample=1)
+    for _ in range(3):
+        assert cfg.a.int_1 == 1
+    assert cfg.get("a.missing", 5) == 5 and cfg.get("b.int_arr") == [0, 1, 2]
+
+    stats = cfg.lookup_stats()
+    assert stats["reads"] == {"a": 3, "a.missing": 1, "b.int_arr": 1}
+    assert stats["misses"] == {"a.missing": 1}
+    assert stats["latency"]["samples"] == 5 and json.loads(json.dumps(stats)) == stats
+
+    assert cfg.lookup_stats(reset=True) == stats
+    assert cfg.lookup_stats()["reads"] == {} and cfg.lookup_stats()["latency"]["samples"] == 0
+
+    cfg.instrument(False)
+    assert "get" not in cfg.__dict__ and cfg.a.int_1 == 1
+
+
+def assert_misses():
+    for index in [False, True]:
+        cfg = Configuration({"a": {"none": None, "zero": 0, "empty": ""}}, index=index).load()
+        assert cfg.a.none is None and cfg.a.zero == 0 and cfg.a.empty == ""
+        assert hasattr(cfg.a, "none") and not hasattr(cfg.a, "missing")
+        assert getattr(cfg, "missing", 1) == 1 and not hasattr(cfg, "__deepcopy__")
+        assert cfg.get("a.none", 1) == 1
+
+        for _ in range(2):
+            assert cfg.get("a.missing", 2) == 2 and not hasattr(cfg, "missing")
+        assert {"a.missing", "missing"} <= cfg._misses and "a.none" not in cfg._misses
+        try:
+            cfg.missing
+            assert False, "Missing attribute was found"
+        except AttributeError as e:
+            assert "missing" in str(e)
+
+        # remembered misses are dropped, as soon as the configuration changes
+        cfg.set("a.missing", 3)
+        assert cfg.get("a.missing") == 3 and cfg.a.missing == 3 and not cfg._misses
+
+        cfg.load({"missing": 4})
+        assert cfg.missing == 4
+
+
+def assert_layered():
+    defaults = {"a": {"x": 1, "y": {"z": 2}}, "b": {"c": 3}, "d": 4, "e": [1, 2]}
+
+    for index in [False, True]:
+        cfg = Configuration(defaults, index=index).load()
+        assert cfg.get("a.missing") is None and "a.missing" in cfg._misses
+
+        cfg.push({"a.x": 10, "a.missing": 5, "b": 30})
+        assert not cfg._misses
+        assert cfg.a.x == 10 and cfg.a.y.z == 2 and cfg.get("a.missing") == 5
+        assert cfg.b == 30 and cfg.get("b.c") is None and cfg.e == [1, 2]
+        assert sorted(cfg.a) == ["missing", "x", "y"] and cfg.a["y"]["z"] == 2
+
+        # a section hides a value below and is merged with the sections below
+        cfg.push({"b": {"f": 6}, "a": {"y": {"w": 7}}})
+        assert cfg.b.f == 6 and cfg.get("b.c") is None
+        assert cfg.a.y.w == 7 and cfg.a.y.z == 2 and cfg.a.x == 10
+        assert cfg.dict()["a.y.w"] == 7 and cfg.dict()["a.x"] == 10 and "b.c" not in cfg.dict()
+        assert cfg.dict(lazy=True)["a.y.z"] == 2
+
+        assert cfg.pop() == {"b": {"f": 6}, "a": {"y": {"w": 7}}}
+        assert cfg.pop()["a"]["x"] == 10
+        assert cfg.a.x == 1 and cfg.b.c == 3 and cfg.get("a.missing") is None
+        assert cfg._conf == defaults
+
+        # a value of None hides the layers below, as it does on merge
+        cfg.push({"a.x": None, "d": None})
+        assert cfg.get("a.x") is None and cfg.get("a.x", 5) == 5 and cfg.a.x is None
+        assert cfg.dict()["a.x"] is None and cfg.d is None and cfg.a.y.z == 2
+        cfg.pop()
+
+        try:
+            cfg.pop()
+            assert False, "Popped a layer of an empty stack"
+        except IndexError:
+            pass
+
+        # concurrent requests pop their own layers by handle
+        first = cfg.push({"a.x": 2})
+        second = cfg.push({"a.x": 3, "b.c": 4})
+        assert cfg.pop(first) is first and cfg.a.x == 3 and cfg.b.c == 4
+        try:
+            cfg.pop(first)
+            assert False, "Popped a layer twice"
+        except ValueError:
+            pass
+        assert cfg.pop(second) is second and cfg.a.x == 1 and not cfg._overrides
+
+    # keys, which contain the seperator, are looked up literally first
+    cfg = Configuration({"a.b": 1, "c": {"d.e": 2, "d": {"e": 3}}}).load()
+    cfg.push({"c": {"f": 4}})
+    assert cfg.get("a.b") == 1 and cfg.get("c.d.e") == 2 and cfg.c.d.e == 3
+    assert cfg.get("a.b.c") is None and cfg.get("c.f.g") is None
+    cfg.push({"c.d.e": 5})
+    assert cfg.get("c.d.e") == 2 and cfg.c.d.e == 5 and cfg.dict()["c.d"]["e"] == 5
+
+    view = Layered({"a": {"x": 10}}, defaults)
+    assert view.a.x == 10 and view.a.y.z == 2 and view.get("d") == 4 and "b" in view
+    assert view.pop().a.x == 1 and view.push({"d": 5}).d == 5 and view.d == 4
+    assert view.dict()["a.x"] == 10 and len(view) == 4
+    assert Layered({"d": None}, defaults)["d"] is None
+
+    # layers are converted with the schema and do not wait for a writer
+    schema = {"a": {"x": int, "t": ("duration", 1.0)}, "b": (int, 0)}
+    cfg = Configuration({"a": {"x": 1}}, schema=schema).load()
+    layers = []
+    with cfg._lock:
+        thread = threading.Thread(target=lambda: layers.append(cfg.push({"a.x": "2", "a.t": "1m"})))
+        thread.start()
+        thread.join(5)
+        assert not thread.is_alive() and cfg.a.x == 2 and cfg.a.t == 60.0
+    assert cfg.pop(layers[0]) is layers[0]
+    for layer in [{"a.x": "two"}, {"a": 5}]:
+        try:
+            cfg.push(layer)
+            assert False, "Pushed an invalid layer"
+        except ValueError:
+            pass
+    assert not cfg._overrides and cfg.a.x == 1
+    try:
+        view.missing
+        assert False, "Missing attribute was found"
+    except AttributeError:
+        pass
+
+
+def assert_override():
+    cfg = Configuration({"a": {"x": 1, "y": 2}, "b": 3}).load()
+
+    with cfg.override({"a.x": 10, "c": 4}) as scoped:
+        assert scoped is cfg and cfg.a.x == 10 and cfg.a.y == 2 and cfg.c == 4
+        with cfg.override({"a": {"x": 100}}):
+            assert cfg.a.x == 100 and cfg.c == 4 and cfg.dict()["a.x"] == 100
+        assert cfg.a.x == 10 and cfg.freeze().c == 4
+
+        # other threads do not see the scope
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append((cfg.a.x, cfg.get("c"))))
+        thread.start()
+        thread.join()
+        assert seen == [(1, None)]
+
+    assert cfg.a.x == 1 and cfg.get("c") is None and cfg._scoped == 0
+
+    # the scope is left, even if an exception is raised
+    try:
+        with cfg.override({"b": 30}):
+            raise KeyError("b")
+    except KeyError:
+        pass
+    assert cfg.b == 3 and cfg._scoped == 0
+
+    async def request(n):
+        with cfg.override({"b": n}):
+            await asyncio.sleep(0)
+            return cfg.b, cfg.a.y
+
+    async def requests():
+        with cfg.override({"a.y": 20}):
+            # tasks inherit the scope, which they are created in
+            return await asyncio.gather(*(request(n) for n in range(10)))
+
+    assert asyncio.run(requests()) == [(n, 20) for n in range(10)]
+    assert cfg.b == 3 and cfg.a.y == 2
+
+    # entering a scope does not wait for a writer, e.g. a reload
+    def scope():
+        with cfg.override({"b": 4}):
+            pass
+
+    with cfg._lock:
+        thread = threading.Thread(target=scope)
+        thread.start()
+        thread.join(5)
+        assert not thread.is_alive() and cfg._scoped == 0
+
+    # layers are converted with the schema
+    cfg = Configuration({"a": {"x": 1}}, schema={"a": {"x": int}}).load()
+    with cfg.override({"a.x": "2"}):
+        assert cfg.a.x == 2
+    try:
+        with cfg.override({"a.x": "two"}):
+            assert False, "Entered a scope with an invalid layer"
+    except ValueError:
+        pass
+    assert cfg.a.x == 1 and cfg._scoped == 0
+
+
+def assert_set():
+    for index in [False, True]:
+        cfg = Configuration("data/json.json", index=index).load()
+        conf = cfg._conf
+
+        cfg.set("a.int_0", 100)
+        cfg.set("api.hostname", "localhost")
+        cfg.set("c.c_a", {"parent": "p"})
+        assert cfg.a.int_0 == 100 and cfg.a.int_1 == 1 and cfg.api.hostname == "localhost"
+        assert cfg.c.c_a.parent == "p" and cfg.c.c_b.parent == "c"
+        assert conf["a"]["int_0"] == 0 and "api" not in conf
+        assert cfg._conf["b"] is conf["b"]
+
+        # a value replaces a section, including its keys
+        cfg.set("c.c_b", 1)
+        assert cfg.get("c.c_b") == 1 and cfg.get("c.c_b.parent") is None
+
+        # a batch is applied at once and discarded on errors
+        with cfg.batch() as b:
+            b.set("a.int_0", 200)
+            b.set("api.port", 8080)
+            assert cfg.a.int_0 == 100
+        assert cfg.a.int_0 == 200 and cfg.api.port == 8080 and cfg.api.hostname == "localhost"
+
+        try:
+            with cfg.batch() as b:
+                b.set("a.int_0", 300)
+                raise KeyError()
+        except KeyError:
+            pass
+        assert cfg.a.int_0 == 200
+        assert len(cfg._layers) == 2
+
+        # a batch has the same result as setting its values one by one
+        cfg.set("d", {"a": {"x": 1}, "b": {"x": 1}})
+        with cfg.batch() as b:
+            for key, val in [("d.a", 6), ("d.a.y", 2), ("d.b", None), ("d.b", {"y": 3})]:
+                b.set(key, val)
+        assert cfg.get("d") == {"a": {"y": 2}, "b": {"y": 3}}
+        cfg.set("d", None)
+
+        for n in range(200):
+            cfg.set(f"tenants.t{n % 50}", {f"k{n}": n})
+        assert all(cfg.get(f"tenants.t{n % 50}.k{n}") == n for n in range(200))
+
+        # values which are set stay on top of a reloaded configuration
+        cfg._stamps.clear()
+        cfg.reload()
+        assert cfg.a.int_0 == 200 and cfg.get("c.c_b") == 1
+        assert cfg.dict() == flatten(cfg._conf, ".")
+
+
+def assert_file_cache():
+    file_cache.clear()
+    c0 = Configuration("data/toml.toml").load()
+    c1 = Configuration("data/toml.toml").load()
+    assert len(file_cache) == 1
+
+    # cached content is shared, but configurations copy it on merge
+    cached = [file_cache.get("data/toml.toml", _readf) for _ in range(2)]
+    assert cached[0] is cached[1]
+    c0.get("b.int_arr").append(3)
+    assert c1.get("b.int_arr") == _default.get("b").get("int_arr")
+    assert_section_b(Configuration("data/toml.toml").load())
+
+    # changed files are parsed again
+    with tempfile.TemporaryDirectory() as d:
+        fp = os.path.join(d, "conf.json")
+        with open(fp, "w") as f:
+            json.dump({"key": 0}, f)
+        assert Configuration(fp).load().key == 0
+        with open(fp, "w") as f:
+            json.dump({"key": 10}, f)
+        assert Configuration(fp).load().key == 10
+
+
+def assert_reload():
+    with tempfile.TemporaryDirectory() as d:
+        fp = os.path.join(d, "conf.json")
+        with open(fp, "w") as f:
+            json.dump({"a": {"x": 0, "y": 0}}, f)
+
+        cfg = Configuration(_default, fp, {"a": {"y": 1}}).load()
+        assert cfg.input_files() == [fp]
+        assert cfg.reload() == []
+
+        with open(fp, "w") as f:
+            json.dump({"a": {"x": 10, "y": 10, "z": 10}}, f)
+        assert sorted(cfg.reload()) == ["a.x", "a.z"]
+        assert cfg.a.x == 10 and cfg.a.y == 1 and cfg.a.z == 10
+        assert_section_b(cfg)
+
+        # rewriting a file with the same content does not notify the callbacks
+        calls = []
+        cfg.on_change(calls.append)
+        with open(fp, "w") as f:
+            json.dump({"a": {"x": 10, "y": 10, "z": 10}}, f)
+        os.utime(fp, ns=(0, 0))
+        assert cfg.reload() == [] and calls == []
+        cfg._callbacks.clear()
+
+        for inotify in [True, False]:
+            changes = []
+            event = threading.Event()
+
+            @cfg.on_change
+            def callback(keys):
+                changes.append(keys)
+                event.set()
+
+            with Watcher(cfg, interval=0.05, inotify=inotify):
+                with open(fp, "w") as f:
+                    json.dump({"a": {"x": inotify}}, f)
+                assert event.wait(5)
+
+            assert "a.x" in changes[-1]
+            assert cfg.a.x is inotify
+            cfg._callbacks.clear()
+
+    # symlinks, whose targets are swapped, like the files of a ConfigMap
+    with tempfile.TemporaryDirectory() as d:
+        for n in range(3):
+            os.mkdir(os.path.join(d, f"..v{n}"))
+            with open(os.path.join(d, f"..v{n}", "conf.json"), "w") as f:
+                json.dump({"a": {"x": n}}, f)
+            os.utime(os.path.join(d, f"..v{n}", "conf.json"), ns=(0, 0))
+        os.symlink("..v0", os.path.join(d, "..data"))
+        os.symlink(os.path.join("..data", "conf.json"), os.path.join(d, "conf.json"))
+
+        cfg = Configuration(os.path.join(d, "conf.json")).load()
+        for n, inotify in [(1, True), (2, False)]:
+            event = threading.Event()
+            cfg.on_change(lambda keys: event.set())
+
+            with Watcher(cfg, interval=0.05, inotify=inotify):
+                os.symlink(f"..v{n}", os.path.join(d, "..tmp"))
+                os.replace(os.path.join(d, "..tmp"), os.path.join(d, "..data"))
+                assert event.wait(5)
+
+            assert cfg.a.x == n
+            cfg._callbacks.clear()
+
 
 def main():
     """Main function to test YACF"""
@@ -153,14 +985,38 @@ def main():
     c_default = Configuration(_default).load()
     c_json = Configuration("data/json.json").load()
     c_toml = Configuration("data/toml.toml").load()
+    c_index = Configuration("data/json.json", index=True).load()
 
     # assert dict, JSON and TOML is parsed properly
-    for c in [c_default, c_json, c_toml]:
+    for c in [c_default, c_json, c_toml, c_index]:
         assert_section_a(c)
         assert_section_b(c)
         assert_section_c(c)
         assert_default(c)
         assert_dict(c)
+        assert_sections(c)
+
+    assert_incremental_load()
+    assert_snapshots()
+    assert_merge()
+    assert_parallel()
+    assert_aload()
+    assert_parsers()
+    assert_snapshot()
+    assert_lazy_json()
+    assert_stream()
+    assert_set()
+    assert_env()
+    assert_argv()
+    assert_schema()
+    assert_freeze()
+    assert_provenance()
+    assert_instrument()
+    assert_misses()
+    assert_layered()
+    assert_override()
+    assert_file_cache()
+    assert_reload()
 
 
 if __name__ == "__main__":
@@ -50,9 +50,241 @@ sample = config.get('api.hostname')
 sample = config.api.hostname
 ```
 
+The attribute notation raises an `AttributeError` for keys which do not
+exist, hence `hasattr(config, 'api')` and `getattr(config, 'api', None)` work
+as expected. Missing keys are remembered until the configuration changes, so
+probing optional keys repeatedly is cheap.
+
 
 ## Additional Features
 
+### Sections
+
+Sections of the configuration are returned as read-only `Section` views. A
+view shares the storage of the configuration, hence accessing a section does
+not copy it, no matter how large it is.
+
+### Flat Index
+
+For configurations which are read on hot paths, a flat index of all keys in
+dot-notation can be enabled. Every lookup is then a single hash probe. The
+index is rebuilt whenever the configuration is loaded.
+
+```
+config = Configuration('api-config.json', index=True).load()
+```
+
+### File Cache
+
+Parsed configuration files are cached process-wide. A cached file is only
+parsed again, if its modification time or size changed. The parsed content is
+shared, not copied, on a hit. The cache is bounded and can be configured or
+cleared via `yacf.cache.file_cache`:
+
+```
+from yacf.cache import file_cache
+
+file_cache.maxsize = 16  # 0 disables the cache
+file_cache.clear()
+```
+
+### Hot Reload
+
+Long running services can pick up changes of the configuration files without
+a restart. `reload()` reads the changed files again and publishes the rebuilt
+configuration at once. `watch()` starts a background thread, which calls
+`reload()` whenever a file changes (inotify on Linux, polling elsewhere):
+
+```
+config = Configuration('defaults.toml', 'custom.toml').load()
+
+@config.on_change
+def changed(keys):
+    print(f"Changed keys: {keys}")
+
+watcher = config.watch()
+...
+watcher.stop()
+```
+
+### Parallel Loading
+
+Many configuration files can be parsed concurrently. Pass the number of
+threads or an executor; the files are merged in their original order:
+
+```
+with ProcessPoolExecutor() as executor:
+    config = Configuration(*fragments, parallel=executor).load()
+```
+
+### Async Loading
+
+In asyncio applications, `aload` reads the inputs without blocking the event
+loop. Besides files and dictionaries, it accepts awaitables and async
+callables returning a dictionary:
+
+```
+config = await Configuration('defaults.toml').aload(fetch_sidecar_config)
+```
+
+### Snapshots
+
+To speed up the start of a process, a merged configuration can be compiled to
+a binary snapshot. As long as none of the inputs changed, `load` restores the
+configuration from the snapshot with a single file read. An outdated or
+missing snapshot is written again after loading the inputs:
+
+```
+config = Configuration('defaults.toml', 'custom.toml', snapshot='config.snapshot').load()
+```
+
+Values set with `set`, `batch` or `stream` are not part of the inputs, hence
+`compile` raises a `ValueError` for a configuration with such values.
+
+### Lazy JSON Files
+
+Large, generated JSON files can be loaded lazily. The file is memory-mapped
+and only the offsets of its top-level sections are indexed. A section is
+parsed and merged on its first access:
+
+```
+config = Configuration('defaults.toml', LazyJSON('tenants.json')).load()
+```
+
+### Environment Variables
+
+Environment variables are read with the `Env` source. Only the variables with
+the given prefix are used, the remainder of the name is split into sections
+at `__` and converted to lower case. Values which look like booleans, numbers,
+lists or objects are converted:
+
+```
+# APP__API__PORT=8080 becomes config.api.port == 8080
+config = Configuration('defaults.toml', Env('APP')).load()
+```
+
+### Command Line Arguments
+
+Command line arguments are read with the `Argv` source, e.g.
+`--api.port=8080` or `--api.port 8080`. The values are converted to the type
+of the values they override:
+
+```
+config = Configuration('defaults.toml', Env('APP'), Argv()).load()
+```
+
+### Streaming Records
+
+Large sets of overrides can be streamed into a loaded configuration. Each
+record maps keys in dot-notation to values. Records are read from a JSON
+lines file or any iterable and merged in chunks:
+
+```
+config.stream('tenant-overrides.jsonl')
+config.stream([{'api.hostname': 'localhost'}, {'api.port': 8080}])
+```
+
+### Setting Values
+
+Values are set in dot-notation. Many values can be set in a batch, which is
+applied at once, or not at all if the block raises an exception:
+
+```
+config.set('api.hostname', 'localhost')
+
+with config.batch() as b:
+    b.set('api.hostname', 'localhost')
+    b.set('api.port', 8080)
+```
+
+Setting a value only copies the sections on its path, hence it is cheap even
+for large configurations.
+
+### Schemas
+
+A schema validates the configuration and converts its values, whenever the
+configuration changes. Hence, the values are converted once and not on each
+lookup. A schema is a dataclass or a dictionary of types and converters:
+
+```
+schema = {'api': {'hostname': str, 'port': (int, 80), 'timeout': 'duration'}}
+config = Configuration('api-config.json', Env('APP'), schema=schema).load()
+
+# APP__API__TIMEOUT=1m30s
+config.api.timeout == 90.0
+```
+
+Missing keys without a default and values which cannot be converted raise a
+`ValueError`.
+
+### Frozen Configurations
+
+A loaded configuration can be frozen into a tree of objects of generated
+classes with slots. Attribute access on a frozen configuration is a plain
+attribute read and it takes much less memory than the nested dictionaries:
+
+```
+frozen = config.freeze()
+frozen.api.hostname
+```
+
+The frozen configuration is immutable and does not follow later changes.
+Sections with the same keys share a generated class. Sections with keys of
+their own, e.g. a map of many tenants, only get a class up to a limit and
+otherwise share a dictionary based class.
+
+### Provenance
+
+With the provenance option, the configuration records which inputs set each
+key. `explain` returns the chain of inputs and their values, the last one
+takes precedence:
+
+```
+config = Configuration('defaults.toml', 'custom.json', Env('APP'), provenance=True).load()
+config.explain('api.port')
+# [('defaults.toml', 80), ('custom.json', 8000), (Env('APP'), 8080)]
+```
+
+### Instrumentation
+
+Lookups can be instrumented to find the keys on hot paths and the ones which
+are never read. The configuration counts reads and misses per key and
+samples the latency of lookups. Disabled, it costs nothing:
+
+```
+config.instrument(sample=100)
+...
+stats = config.lookup_stats(reset=True)
+json.dumps(stats)
+```
+
+### Override Layers
+
+Small overrides, e.g. per request or per tenant, can be put on top of the
+configuration as layers. Layers are not merged into the configuration, keys
+are resolved in the layers first, on read. Pushing and popping a layer only
+costs time proportional to its size:
+
+```
+layer = config.push({"api.timeout": 5})
+config.api.timeout  # 5
+config.pop(layer)
+```
+
+Pushed layers are visible to all threads. Pop a layer by the handle, which
+`push` returns, to not remove the layer of another thread by accident.
+
+A `Layered` view resolves keys across plain dictionaries in the same way,
+without a configuration: `Layered(overrides, defaults).api.timeout`.
+
+Overrides, which are only visible to the current thread or asyncio task,
+e.g. for a single request, are set in a scope:
+
+```
+with config.override({"api.timeout": 5}):
+    await handle(request)
+```
+
 ### Custom Seperator
 
 If you, for some reason dislike the regular seperator '.' in the dot notation
@@ -65,6 +297,12 @@ you can choose a custom one when initializing the configuration instance.
 * json
 * toml
 
+The fastest installed parser is used for each file type: `orjson` or the
+standard `json` module for JSON files, `tomllib` (Python 3.11+), `tomli` or
+`toml` for TOML files. Install `yacf[fast]` to get `orjson`. Custom parsers
+can be registered with `yacf.parsers.register()`. Loaders, which parse a file
+object like `json.load`, can still be added to `ACCEPTED_FILE_EXTENSIONS`.
+
 
 
 ## Caveats
@@ -79,11 +317,20 @@ the default seperator `.`. Since the `.` has a special meaning in Python, it is
 easiest to use. To keep the framework simple and still flexible, we decided to
 not add an internal representation to circumvent the seperator limitation.
 
+The attribute notation can not reach keys, which have the name of a method of
+the `Configuration` class, e.g. `get`, `set`, `load`, `reload`, `watch`,
+`freeze`, `push`, `pop` or `override`. `config.reload` returns the
+method, use `config.get("reload")` to read such keys.
+
 """
 
 
 # first party
 from .configuration import Configuration
+from .layered import Layered
+from .schema import Schema
+from .section import Section
+from .sources import Argv, Env, LazyJSON, Source
 
 __version__ = (1, 1, 1)
 
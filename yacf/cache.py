@@ -0,0 +1,72 @@
+"""Process-wide cache of parsed configuration files.
+"""
+
+# standard lib
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable
+
+
+class FileCache:
+    """A bounded LRU cache of parsed configuration files. It is shared by all
+    `Configuration` instances of a process, hence loading the same, unchanged
+    file several times parses it only once.
+
+    An entry is only used, if the modification time, the size and the inode of
+    the file did not change since it was parsed. The parsed content is shared by all
+    callers and must not be modified. Configurations never modify their inputs,
+    merging copies them.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """Creates a new file cache.
+
+        :param maxsize: Maximum number of cached files, 0 disables the cache
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, file_path: str, parse: Callable[[str], dict]) -> dict:
+        """Returns the parsed content of a file. The file is only parsed, if
+        it is not cached yet or changed since it was cached.
+
+        :param file_path: Path of the file to read
+        :param parse: Function to parse the file, if the cache misses
+        :return: parsed content, shared with other callers
+        """
+        if self.maxsize <= 0:
+            return parse(file_path)
+
+        st = os.stat(file_path)
+        key = os.path.abspath(file_path)
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        content = parse(file_path)
+
+        with self._lock:
+            self._entries[key] = (stamp, content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return content
+
+    def clear(self):
+        """Removes all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+# cache used by all configurations
+file_cache = FileCache()
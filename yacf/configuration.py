@@ -3,22 +3,40 @@
 
 
 # standard lib
-from json import load as json_load
-from os import path
-from typing import Any
-
-# third party
-from toml import load as toml_load
+import asyncio
+import inspect
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from os import path, stat
+from threading import Lock
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, Optional, Union
 
 # first party
-from yacf.utils import deep_update, add_dot_notations
+from yacf import snapshot
+from yacf.cache import file_cache
+from yacf.frozen import freeze
+from yacf.index import DELETED, FlatIndex
+from yacf.instrument import Instrument
+from yacf.layered import Layered, resolve
+from yacf.parsers import PARSERS, get_parser
+from yacf.schema import Schema
+from yacf.section import FlatView, check_attribute, wrap
+from yacf.sources import Source
+from yacf.utils import _copy, find, flatten, iter_flat, lookup, merge, replaces, unflatten
+from yacf.watcher import Watcher
+
+_MISSING = object()
+
+# maximum number of missing keys to remember, per published configuration
+MAX_MISSES = 1024
+
+# override layers of the active scopes, per configuration
+_scopes = ContextVar("yacf_scopes", default={})
 
-ACCEPTED_FILE_EXTENSIONS = {
-    # TODO: Load ini file
-    # ".ini":
-    ".json": json_load,
-    ".toml": toml_load,
-}
+# TODO: Load ini file
+ACCEPTED_FILE_EXTENSIONS = PARSERS
 
 
 class Configuration:
@@ -44,9 +62,26 @@ class Configuration:
     mimics the dictionary `.get()` method, with an additional feature. You can
     also access configuration parameters by simply concatenating the keys in
     dot-notation.
+
+    A configuration can be read from many threads at once. The loaded
+    configuration is an immutable snapshot: `load()` and `reload()` never
+    modify it, but build a new one which shares all unchanged sections with
+    the previous one. The new snapshot is published with a single assignment.
+    Readers do not need any lock, they either see the previous or the new
+    snapshot. A `Section` keeps referring to the snapshot it was taken from.
+    Writers are serialized by a lock.
     """
 
-    def __init__(self, *args, seperator="."):
+    def __init__(
+        self,
+        *args,
+        seperator=".",
+        index=False,
+        parallel=None,
+        snapshot=None,
+        schema=None,
+        provenance=False,
+    ):
         """Creates a new configuration parser object. Use the *args parameter
         to parse an arbitrary number of different configuration resources,
         e.g. a default configuration file, a custom configuration file and
@@ -56,155 +91,1077 @@ class Configuration:
         concatenation. By default, it is a '.', since it's called the
         'dot' notation.
 
+        If the index is enabled, a flat index of all keys in dot-notation is
+        built whenever the configuration changes. Each lookup is then a single
+        hash probe instead of a walk through the nested sections. The index
+        costs memory proportional to the number of keys in the configuration.
+
+        Files can be parsed in parallel. Set parallel to the number of threads
+        to use, or pass an executor, e.g. a `ProcessPoolExecutor` to parse
+        pure-Python formats like TOML on several cores. The contents are
+        merged in the original order, the result does not differ from the
+        sequential loading.
+
+        If a snapshot path is given, the first `load` restores the merged
+        configuration from the binary snapshot, as long as the inputs did not
+        change. Otherwise, the inputs are loaded and the snapshot is written.
+
+        If a schema is given, it is compiled once. A compiled `Schema` can be
+        shared by many configurations. Whenever the configuration
+        changes, it is validated and the values are converted to the types of
+        the schema, before the configuration is published. Hence, `get`
+        returns converted values without any cost per lookup. See
+        `yacf.schema` for the format of the schema.
+
+        If provenance is enabled, the configuration records which inputs set
+        each key, see `explain`. The record is kept in a table of its own,
+        lookups do not get slower.
+
         :param *args: Defines the configuration input
         :param seperator: Seperator character to use for the dot-notation
+        :param index: Build a flat index of all keys for fast lookups
+        :param parallel: Number of threads or executor to parse files with
+        :param snapshot: Path of a binary snapshot to restore from
+        :param schema: Schema, dataclass or dictionary to validate with
+        :param provenance: Record which inputs set each key
         """
         self._conf = dict()
         self._seperator = seperator
         self._input = [arg for arg in args]
+        self._index = FlatIndex({}) if index else None
+        self._loaded = 0
+        self._layers = []
+        self._stamps = dict()
+        self._callbacks = []
+        self._lock = Lock()
+        self._parallel = parallel
+        self._snapshot = snapshot
+        self._pending = frozenset()
+        self._edits_at = None
+        if schema is not None and not isinstance(schema, Schema):
+            schema = Schema(schema, seperator)
+        self._schema = schema
+        self._frozen = (None, None)
+        self._provenance = dict() if provenance else None
+        self._instrument = None
+        self._misses = set()
+        self._overrides = ()
+        # guards the override layers, not held while loading
+        self._overrides_lock = Lock()
+        self._scoped = 0
+        # guards the counter of active scopes, not held while loading
+        self._scope_lock = Lock()
 
     def __getattr__(self, key: str) -> Any:
         """Gets an attribute of the class. Internally, it calls get() and
         raises an Attribute error, if the attribute does not exist. The
         function is little more than syntactic sugar.
 
+        A key which is stored with the value `None` returns `None`, only a key
+        which does not exist raises an AttributeError. Hence, `hasattr` and
+        `getattr` with a default work as expected.
+
         :param key: Name of the attribute to look up
         :type key: str
         :raises AttributeError: Raised if attribute does not exist.
         :return: Value of the attribute
         :rtype: Any
         """
-        if self._seperator != ".":
-            raise AttributeError(
-                "Attribute notation can not be used if seperator is not the default `.`"
-            )
+        check_attribute(key, self._seperator)
 
-        val = self._get(self._conf, key, None)
+        val = self.get(key, _MISSING)
+        if val is not _MISSING:
+            return val
 
-        if val is None:
-            raise AttributeError()
+        layers = self._active_overrides() + (self._conf,)
+        if key not in self._misses and resolve(layers, key, ".", _MISSING) is None:
+            return None
 
-        return val
+        raise AttributeError(f"Configuration has no attribute '{key}'")
 
-    def dict(self) -> dict:
-        """Convert the configuration object to a dictionary
-        :return: generated dict
-        """
-        return add_dot_notations(self._conf, self._seperator)
+    def dict(self, lazy: bool = False) -> Mapping:
+        """Convert the configuration object to a dictionary, which contains
+        each key in dot-notation as well as the sections. The configuration
+        itself is not modified.
 
-    def _get(self, section: dict, key: str, default: Any) -> Any:
-        """Private get, to recursively search the config.
-
-        :param section: Section to search through.
-        :param key: Requested key
-        :param default: Default value to return
-        :return Value of the requested key.
+        :param lazy: Return a lazy `FlatView` instead of building a dict
+        :return: generated dict
         """
-        val = None
-
-        while val is None:
-            # If section contains key, return it
-            if key in section.keys():
-                val = section.get(key)
-                if isinstance(val, dict) and val:
-                    # Non empty dict
-                    val = Configuration(val).load()
-                break
+        self._materialize_all()
 
-            # Last section to search through, if key not in here, skip
-            if self._seperator not in key:
-                break
+        overrides = self._active_overrides()
+        if overrides:
+            conf = Layered(*overrides, self._conf).merged()
+            return FlatView(conf, self._seperator) if lazy else flatten(conf, self._seperator)
+        if lazy:
+            return FlatView(self._conf, self._seperator)
+        if self._index is not None:
+            return self._index.dict()
+        return flatten(self._conf, self._seperator)
 
-            k, remainder = key.split(self._seperator, 1)
-            if k not in section:
-                # key is invalid and does not exist
-                break
+    def freeze(self) -> Any:
+        """Returns a frozen copy of the configuration. Each section is an
+        instance of a generated class with slots, hence reading an attribute,
+        e.g. `frozen.api.hostname`, is a plain attribute access. The frozen
+        copy uses much less memory than the configuration itself. See
+        `yacf.frozen.freeze`.
 
-            val = self._get(section.get(k), remainder, default)
-            break
+        The frozen copy does not follow later changes of the configuration.
+        Call `freeze` again to get an up to date copy, it is only rebuilt if
+        the configuration changed in the meantime.
 
-        return default if val is None else val
-
-    def _set(self, section: dict, key: str, val: Any):
-        """Privte set, to recursively search for the key and update the value.
-
-        :param section: Section to search through
-        :param key: Parameter to be updated
-        :param val: New value
+        :return: frozen configuration
         """
-        if isinstance(val, dict) and val:
-            # Non empty dict
-            val = Configuration(val).load()
+        self._materialize_all()
 
-        # Last section ? Then set key:
-        if self._seperator not in key:
-            section[key] = val
-        else:
-            k, remainder = key.split(self._seperator, 1)
-            if k not in section:
-                section[k] = Configuration({}).load()
+        overrides = self._active_overrides()
+        if overrides:
+            return freeze(Layered(*overrides, self._conf).merged())
+
+        conf, frozen = self._frozen
+        if conf is not self._conf:
+            conf = self._conf
+            frozen = freeze(conf)
+            self._frozen = (conf, frozen)
 
-            self._set(section.get(k), remainder, val)
+        return frozen
 
     def get(self, key: str, default: Any = None) -> Any:
         """Tries to find the key in the dictionary and returns the value, if it
         exists. Function mimics the `dict.get()` function. If the key describes
-        a (sub)section, the return value is a newly parsed instance of the
-        `Configuration` class.
+        a (sub)section, the return value is a read-only `Section` view on it.
+        Creating the view does not copy the section.
+
+        Keys which do not exist are remembered, until the configuration
+        changes. Looking them up again returns the default immediately.
 
         :param key: The key to look for.
         :param default: The default value to return to.
         :return: Value of the requested key.
         """
-        return self._get(self._conf, key, default)
+        if self._scoped:
+            scope = _scopes.get().get(self)
+            if scope:
+                if self._pending:
+                    self._materialize(key)
+                return self._resolve(scope + self._overrides, key, default)
+
+        # read before the configuration, it is replaced after the configuration
+        misses = self._misses
+        if key in misses:
+            return default
+
+        if self._pending:
+            self._materialize(key)
+
+        if self._overrides:
+            return self._resolve(self._overrides, key, default)
+
+        # read once, the returned section must use the index it was found in
+        index = self._index
+        if index is not None:
+            val = index.get(key, _MISSING)
+        else:
+            val = find(self._conf, key, self._seperator, _MISSING)
+
+        if val is None:
+            return default
+        if val is _MISSING:
+            if len(misses) >= MAX_MISSES:
+                misses.clear()
+            misses.add(key)
+            return default
+
+        return wrap(val, self._seperator, index, key)
+
+    def push(self, layer: dict) -> dict:
+        """Puts an override layer on top of the configuration. Until it is
+        removed with `pop`, lookups resolve keys in the override layers first,
+        from the last pushed one down to the configuration. Nothing is merged
+        and the configuration is not copied, hence pushing and popping only
+        costs time proportional to the size of the layer.
+
+        The layer may use keys in dot-notation. Overrides are visible to all
+        readers of the configuration, use `override` for overrides which are
+        only visible to the current thread or task. With a schema, the values
+        of the layer are validated and converted.
+
+        :param layer: Dictionary of values to override
+        :raises ValueError: Raised if the layer does not match the schema
+        :return: the pushed layer, which is the handle to pop it again
+        """
+        layer = self._convert(unflatten(layer, self._seperator))
+
+        with self._overrides_lock:
+            self._overrides = (layer,) + self._overrides
+            self._misses = set()
+
+        return layer
+
+    def pop(self, handle: dict = None) -> dict:
+        """Removes an override layer. Pass the handle returned by `push`, to
+        remove exactly this layer, even if other layers were pushed on top of
+        it in the meantime, e.g. by concurrent requests. Without a handle, the
+        layer, which was pushed last, is removed.
+
+        :param handle: Layer returned by `push`
+        :raises IndexError: Raised if there is no override layer
+        :raises ValueError: Raised if the handle is not an override layer
+        :return: the removed layer
+        """
+        with self._overrides_lock:
+            if not self._overrides:
+                raise IndexError("There is no override layer to pop")
+
+            n = 0
+            if handle is not None:
+                n = next((n for n, layer in enumerate(self._overrides) if layer is handle), None)
+                if n is None:
+                    raise ValueError("The layer is not an override layer")
+
+            layer = self._overrides[n]
+            self._overrides = self._overrides[:n] + self._overrides[n + 1 :]
+            self._misses = set()
+
+        return layer
+
+    @contextmanager
+    def override(self, layer: dict) -> Iterator["Configuration"]:
+        """Overrides values within a scope. The overrides are only visible in
+        the current context, i.e. in the current thread or asyncio task and
+        the tasks created within the scope. Other threads and tasks read the
+        configuration as before. Scopes can be nested, the innermost scope
+        has the highest priority.
+
+        ```
+        with config.override({"api.timeout": 5}):
+            config.api.timeout  # 5
+        ```
+
+        Entering and leaving a scope costs time proportional to the size of
+        the layer. As long as no scope is active, lookups are not slowed down.
+        With a schema, the values of the layer are validated and converted.
+
+        :param layer: Dictionary of values to override
+        :raises ValueError: Raised if the layer does not match the schema
+        :return: the configuration itself
+        """
+        layer = self._convert(unflatten(layer, self._seperator))
+        scopes = _scopes.get()
+        token = _scopes.set({**scopes, self: (layer,) + scopes.get(self, ())})
+
+        with self._scope_lock:
+            self._scoped += 1
+        try:
+            yield self
+        finally:
+            with self._scope_lock:
+                self._scoped -= 1
+            _scopes.reset(token)
+
+    def instrument(self, enabled: bool = True, sample: int = 100) -> Optional[Instrument]:
+        """Enables or disables the instrumentation of lookups. If enabled,
+        the configuration counts the reads and misses of each key and samples
+        the latency of lookups. Use `lookup_stats()` to export the counters.
+
+        Lookups are instrumented by replacing `get` of this configuration,
+        hence they do not pay anything while the instrumentation is disabled.
+        Lookups on `Section` views are not instrumented.
+
+        :param enabled: Enable or disable the instrumentation
+        :param sample: Measure the latency of every n-th lookup, 0 disables it
+        :return: the instrument, None if disabled
+        """
+        if not enabled:
+            self.__dict__.pop("get", None)
+            self._instrument = None
+            return None
+
+        self._instrument = Instrument(sample)
+        # wraps the lookup of the class, not a previously instrumented one
+        self.get = self._instrument.wrap(Configuration.get.__get__(self), _MISSING)
+        return self._instrument
+
+    def lookup_stats(self, reset: bool = False) -> dict:
+        """Exports the counters of the instrumentation, see `instrument`.
+
+        :param reset: Reset the counters at once
+        :raises ValueError: Raised if the instrumentation is not enabled
+        :return: dictionary of the reads and misses per key and the latencies
+        """
+        if self._instrument is None:
+            raise ValueError("Lookups are not instrumented, see `instrument()`")
+        return self._instrument.reset() if reset else self._instrument.stats()
 
     def set(self, key: str, val: Any):
-        """Sets a value of a configuration option.
+        """Sets a value of a configuration option. The key is given in
+        dot-notation, missing sections are created. If the value is a
+        dictionary, it is merged into the existing section, just like another
+        input would be.
+
+        Values which are set take precedence over the inputs loaded so far.
+        Only the sections on the path to the key are copied, hence the cost
+        does not depend on the size of the configuration. Use `batch` to set
+        many values at once.
+
+        :param key: Key in dot-notation
+        :param val: New value
+        """
+        with self._lock:
+            self._apply([unflatten({key: val}, self._seperator)])
+
+    @contextmanager
+    def batch(self) -> Iterator["Batch"]:
+        """Collects many changes and applies them at once. The changes are
+        published together when the block exits, concurrent readers never see
+        only a part of them. If the block raises an exception, none of the
+        changes are applied.
+
+        ```
+        with config.batch() as b:
+            b.set('api.hostname', 'localhost')
+            b.set('api.port', 8080)
+        ```
+
+        :return: the batch to collect the changes in
         """
+        batch = Batch(self._seperator)
+        yield batch
+
+        if batch.patches[0]:
+            with self._lock:
+                self._apply(batch.patches)
 
     def load(self, *args):
         """Loads the predefined input configuration files/dictionaries.
         Optionally, one can add even more input sources with this function.
 
+        The configuration remembers which inputs are already merged. Calling
+        `load` again only reads and merges the newly added inputs on top of
+        the existing configuration, the priority order stays the same.
+
         :param *args: files or dictionaries to add to configuration
         """
-        self._input += [arg for arg in args]
-
-        for i in self._input:
-            if isinstance(i, dict):
-                # simply a dictionary
-                other = i
-            elif isinstance(i, str):
-                # assume it is a path to a file
-                try:
-                    other = _readf(i)
-                except Exception as e:
-                    raise e
-            else:
-                raise TypeError(f"Cannot load a configuration of type {type(i)}")
+        with self._lock:
+            self._input += [arg for arg in args]
+            inputs = self._input[self._loaded :]
+            self._stamps.update({i: _stamp(i) for i in inputs if isinstance(i, str)})
+
+            if self._snapshot is None or self._loaded > 0:
+                self._merge(self._read_all(inputs))
+                return self
+
+            fp = snapshot.fingerprint(inputs)
+            conf = None if fp is None else snapshot.read(self._snapshot, fp)
+            if conf is not None:
+                # The parsed inputs are unknown, until they are needed
+                self._layers = [None] * len(inputs)
+                self._loaded = len(inputs)
+                self._publish(conf)
+                return self
+
+            self._merge(self._read_all(inputs))
+            if fp is not None:
+                snapshot.write(self._snapshot, fp, self._conf)
+
+        return self
+
+    def stream(self, source: Union[str, Iterable[Mapping]], chunk_size: int = 10_000):
+        """Applies a stream of records on top of the configuration. Each record
+        maps keys in dot-notation to values, e.g. `{"api.hostname": "host"}`.
+        The source is either a file with one JSON record per line, or any
+        iterable of records.
+
+        The records are consumed incrementally and merged in chunks, hence the
+        memory does not grow with the length of the stream, but only with the
+        number of distinct keys. The result is published once at the end.
+        Just like values set with `set`, the records take precedence over the
+        inputs loaded so far.
+
+        :param source: Path of a JSON lines file or an iterable of records
+        :param chunk_size: Number of records to merge at once
+        :return: the configuration itself
+        """
+        records = _read_records(source) if isinstance(source, str) else iter(source)
+
+        def patches() -> Iterator[dict]:
+            patch = dict()
+            n = 0
+            for record in records:
+                if n == chunk_size or replaces(patch, record, self._seperator):
+                    # A chunk ends early, if a value would become a section
+                    yield patch
+                    patch = dict()
+                    n = 0
+                unflatten(record, self._seperator, patch)
+                n += 1
+            if patch:
+                yield patch
+
+        with self._lock:
+            self._apply(patches())
+
+        return self
+
+    def compile(self, file_path: str = None):
+        """Writes a binary snapshot of the loaded configuration. A
+        configuration created with the snapshot option restores itself from
+        the snapshot in `load`, as long as none of its inputs changed.
+
+        Values set with `set`, `batch` or `stream` are no input of the
+        configuration, which could be restored, hence they are not compiled.
+
+        :param file_path: Path of the snapshot, defaults to the snapshot option
+        :raises ValueError: Raised if the inputs cannot be fingerprinted or
+            values were set
+        """
+        file_path = file_path or self._snapshot
+
+        with self._lock:
+            if self._edits_at is not None:
+                raise ValueError("Configurations with values set by set, batch or stream cannot be compiled")
+            fp = snapshot.fingerprint(self._input[: self._loaded])
+            if fp is None:
+                raise ValueError("Only files and dictionaries can be compiled to a snapshot")
+            snapshot.write(file_path, fp, self._conf)
 
-            self._conf = deep_update(self._conf, other)
+    async def aload(self, *args, concurrency: int = 8):
+        """Asynchronous counterpart of `load`. Files are read in an executor,
+        hence the event loop is not blocked. Additionally to dictionaries and
+        files, the inputs can be awaitables or async callables, which return
+        a dictionary, e.g. to fetch a configuration from a remote service.
+
+        All new inputs are read concurrently, at most `concurrency` at once.
+        Afterwards, they are merged in their original order, exactly as
+        `load` does. If any input fails, nothing is merged.
+
+        :param *args: files, dictionaries or async sources to add
+        :param concurrency: Maximum number of inputs to read at once
+        :return: the configuration itself
+        """
+        # New inputs are only added, once all of them are read
+        start = self._loaded
+        inputs = self._input[start:] + [arg for arg in args]
+
+        loop = asyncio.get_running_loop()
+        executor = self._parallel if isinstance(self._parallel, Executor) else None
+        semaphore = asyncio.Semaphore(concurrency)
+        files = [i for i in inputs if isinstance(i, str)]
+        stamps = dict(zip(files, await loop.run_in_executor(executor, _stamps, files)))
+
+        async def read(i: Any) -> dict:
+            async with semaphore:
+                if isinstance(i, str):
+                    return await loop.run_in_executor(executor, _readf, i)
+                if callable(i):
+                    i = i()
+                if inspect.isawaitable(i):
+                    i = await i
+                return _read(i)
+
+        contents = await asyncio.gather(*[read(i) for i in inputs])
+
+        # The lock is held by reloads while parsing, do not block the loop
+        await self._acquire(loop)
+        try:
+            if self._loaded != start:
+                raise RuntimeError("Configuration was loaded concurrently")
+            self._input += [arg for arg in args]
+            self._stamps.update(stamps)
+            self._merge(contents)
+        finally:
+            self._lock.release()
 
-        # self._conf = add_dot_notations(self._conf, self._seperator)
         return self
 
+    async def _acquire(self, loop: asyncio.AbstractEventLoop):
+        """Acquires the lock without blocking the event loop. If the lock is
+        held, it is acquired in an executor.
+
+        :param loop: Running event loop
+        """
+        if self._lock.acquire(blocking=False):
+            return
+
+        future = loop.run_in_executor(None, self._lock.acquire)
+        try:
+            await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The executor acquires the lock anyway, release it right away
+            future.add_done_callback(lambda _: self._lock.release())
+            raise
+
+    def _merge(self, contents: Iterable[dict]):
+        """Merges the contents of the new inputs into the configuration and
+        publishes the result. The caller must hold the lock.
+
+        :param contents: Contents of the inputs to merge, in order
+        """
+        conf = self._conf
+        changes = dict()
+        loaded, pending = self._loaded, self._pending
+
+        try:
+            for other in contents:
+                if callable(other):
+                    # The content of the source depends on the inputs before it
+                    other = other(conf)
+                self._layers.append(other)
+                self._loaded += 1
+
+                if not isinstance(other, dict):
+                    # Lazy sources are merged on first access
+                    self._pending = self._pending.union(other)
+                    continue
+
+                conf = merge(conf, other)
+                if self._index is not None:
+                    self._patch_index(changes, conf, other)
+                if self._provenance is not None:
+                    self._record(len(self._layers) - 1, other)
+        finally:
+            # Publish whatever was merged, even if an input failed
+            try:
+                self._publish(conf, changes)
+            except ValueError:
+                # Not valid according to the schema, nothing is merged
+                del self._layers[loaded:]
+                self._loaded, self._pending = loaded, pending
+                self._record_all()
+                raise
+
+    def _apply(self, patches: Iterable[dict]):
+        """Merges patches into the configuration and publishes the result once.
+        The patches are recorded in an input of their own, which is placed
+        after the loaded inputs. The caller must hold the lock.
+
+        :param patches: Nested dictionaries to merge, in order
+        """
+        conf = self._conf
+        changes = dict()
+
+        n = self._loaded - 1
+        if n < 0 or self._edits_at != n:
+            # The last loaded input does not hold edits, start a new one
+            self._input.insert(self._loaded, dict())
+            self._layers.append(dict())
+            self._loaded += 1
+            n = self._edits_at = self._loaded - 1
+        edits = self._layers[n]
+        touched = dict()
+
+        try:
+            for patch in patches:
+                conf = merge(conf, patch)
+                edits = merge(edits, patch)
+                if self._schema is not None:
+                    touched = merge(touched, patch)
+                if self._index is not None:
+                    self._patch_index(changes, conf, patch)
+                if self._provenance is not None:
+                    self._record(n, patch)
+        finally:
+            before = self._layers[n]
+            self._input[n] = self._layers[n] = edits
+            try:
+                self._publish(conf, changes, touched)
+            except ValueError:
+                # Not valid according to the schema, nothing is applied
+                self._input[n] = self._layers[n] = before
+                self._record_all()
+                raise
+
+    def input_files(self) -> List[str]:
+        """Returns the file inputs of the configuration, which are loaded.
+
+        :return: list of file paths
+        """
+        return [i for i in self._input[: self._loaded] if isinstance(i, str)]
+
+    def on_change(self, callback: Callable[[List[str]], Any]) -> Callable:
+        """Registers a callback, which is called whenever a reload changed the
+        configuration. The callback receives the list of changed keys in
+        dot-notation. Can be used as a decorator as well.
+
+        :param callback: Function to call on changes
+        :return: the callback
+        """
+        self._callbacks.append(callback)
+        return callback
+
+    def reload(self, *paths: str) -> List[str]:
+        """Reads the file inputs again, which changed since they were loaded.
+        Unchanged files are not read again. The configuration is rebuilt from
+        the loaded inputs and published at once, so concurrent readers either
+        see the previous or the new configuration.
+
+        :param *paths: Files to check, by default all file inputs are checked
+        :return: list of changed keys in dot-notation
+        """
+        with self._lock:
+            layers = list(self._layers)
+            stamps = dict()
+            outdated = []
+
+            for n, i in enumerate(self._input[: self._loaded]):
+                if not isinstance(i, str) or (paths and i not in paths):
+                    continue
+
+                stamp = _stamp(i)
+                if stamp != self._stamps.get(i):
+                    stamps[i] = stamp
+                    outdated.append(n)
+
+            if not outdated:
+                return []
+
+            # Inputs restored from a snapshot need to be read once
+            unknown = [n for n, layer in enumerate(layers) if layer is None and n not in outdated]
+
+            changed = []
+            contents = self._read_all([self._input[n] for n in outdated + unknown])
+            for n, other in zip(outdated + unknown, contents):
+                layers[n] = other
+                if n in outdated:
+                    old = self._layers[n]
+                    changed.append((self._conf if old is None else old, other))
+
+            conf = self._validate(self._build(layers))
+            keys = self._changed_keys(conf, changed)
+            self._layers = layers
+            self._stamps.update(stamps)
+            self._record_all()
+            self._publish(conf)
+
+        if keys:
+            for callback in self._callbacks:
+                callback(keys)
+
+        return keys
+
+    def watch(self, interval: float = 1.0) -> Watcher:
+        """Starts watching the file inputs and reloads the configuration
+        whenever one of them changes. Use `on_change()` to get notified about
+        the changes.
+
+        :param interval: Polling interval in seconds, if inotify is not used
+        :return: the running watcher, call `stop()` to stop watching
+        """
+        return Watcher(self, interval).start()
+
+    def explain(self, key: str) -> List[tuple]:
+        """Explains where the value of a key comes from. Returns the chain of
+        inputs, which set the key, with a copy of the value of each input. The
+        last one takes precedence. Values set with `set`, `batch` or `stream` are
+        reported with the input `"set"`. The chain starts after the last input,
+        which replaced a parent section of the key with a value.
+
+        Requires the provenance option. Inputs restored from a snapshot are
+        only known after they were read again, e.g. by `reload`.
+
+        :param key: Key in dot-notation
+        :raises ValueError: Raised if provenance is not recorded
+        :return: list of tuples of the input and its value
+        """
+        if self._provenance is None:
+            raise ValueError("Provenance is not recorded, see the provenance option")
+
+        if self._pending:
+            self._materialize(key)
+
+        with self._lock:
+            current = lookup(self._conf, key, self._seperator, _MISSING)
+            if current is _MISSING:
+                return []
+
+            # Inputs before the last one, which replaced a parent section or,
+            # if the key is a section, the key itself with a value, are hidden
+            parts = key.split(self._seperator)
+            parents = [self._seperator.join(parts[: i + 1]) for i in range(len(parts) - 1)]
+            if isinstance(current, dict):
+                parents.append(key)
+            cut = max(
+                (n for k in parents for n in self._provenance.get(k, ()) if not isinstance(self._value(n, k), dict)),
+                default=-1,
+            )
+
+            chain = []
+            for n in self._provenance.get(key, ()):
+                if n > cut:
+                    source = "set" if n == self._edits_at else self._input[n]
+                    # The inputs are shared, e.g. with the file cache
+                    chain.append((source, _copy(self._value(n, key))))
+
+            return chain
+
+    def _value(self, n: int, key: str) -> Any:
+        """Looks up a key in the content of a loaded input.
+
+        :param n: Position of the input
+        :param key: Key in dot-notation
+        :return: value of the key in the input
+        """
+        layer = self._layers[n]
+        if not isinstance(layer, dict):
+            head = key.split(self._seperator, 1)[0]
+            layer = {head: layer[head]}
+        return lookup(layer, key, self._seperator)
+
+    def _materialize(self, key: str):
+        """Merges the sections of lazy sources, which are required to look up
+        the given key. A section is merged from all inputs, which contain it,
+        in the order of the inputs.
+
+        :param key: Key to look up, a top-level key or in dot-notation
+        """
+        keys = [k for k in (key, key.split(self._seperator, 1)[0]) if k in self._pending]
+        if not keys:
+            return
+
+        with self._lock:
+            conf = dict(self._conf)
+            changes = dict()
+
+            for k in keys:
+                if k not in self._pending:
+                    continue
+
+                section = dict()
+                for n, layer in enumerate(self._layers):
+                    if layer is not None and k in layer:
+                        section = merge(section, {k: layer[k]})
+                        if self._provenance is not None:
+                            self._record(n, {k: layer[k]})
+
+                conf[k] = section[k]
+                if self._index is not None:
+                    self._patch_index(changes, conf, section)
+                self._pending = self._pending.difference([k])
+
+            self._publish(conf, changes)
+
+            if not self._pending:
+                # All lazy sections are merged, the sources are not read again
+                for layer in self._layers:
+                    if isinstance(layer, Source):
+                        layer.close()
+
+    def _materialize_all(self):
+        """Merges all pending sections of lazy sources."""
+        for k in self._pending:
+            self._materialize(k)
+
+    def _build(self, layers: list) -> dict:
+        """Merges the given inputs to a new configuration. Sections of lazy
+        sources, which are not merged yet, are skipped. Contents which depend
+        on the inputs before them are resolved and replaced in the list.
+
+        :param layers: Contents of the inputs, in order
+        :return: merged configuration
+        """
+        conf = dict()
+
+        for n, layer in enumerate(layers):
+            if callable(layer):
+                layer = layers[n] = layer(conf)
+            if not isinstance(layer, dict):
+                layer = {k: layer[k] for k in layer if k not in self._pending}
+            conf = merge(conf, layer)
+
+        return conf
+
+    def _record(self, n: int, layer: dict):
+        """Records the input as source of all keys of its content. The caller
+        must hold the lock.
+
+        :param n: Position of the input
+        :param layer: Content of the input, or a part of it
+        """
+        table = self._provenance
+
+        for key, _ in iter_flat(layer, self._seperator):
+            sources = table.get(key, ())
+            if not sources or sources[-1] != n:
+                table[key] = sources + (n,)
+
+    def _record_all(self):
+        """Records the sources of all keys again, from the loaded inputs. The
+        caller must hold the lock.
+        """
+        if self._provenance is None:
+            return
+
+        self._provenance = dict()
+        for n, layer in enumerate(self._layers):
+            if layer is None:
+                continue
+            if not isinstance(layer, dict):
+                layer = {k: layer[k] for k in layer if k not in self._pending}
+            self._record(n, layer)
+
+    def _read_all(self, inputs: list) -> Iterator[dict]:
+        """Reads the given inputs and yields their content in order. If the
+        configuration is set up to read in parallel, all files are submitted
+        at once and parsed concurrently.
+
+        :param inputs: Inputs to read
+        :return: iterator of the contents of the inputs
+        """
+        if not self._parallel or sum(isinstance(i, str) for i in inputs) < 2:
+            for i in inputs:
+                yield _read(i)
+            return
+
+        if isinstance(self._parallel, Executor):
+            executor = self._parallel
+        else:
+            executor = ThreadPoolExecutor(max_workers=self._parallel)
+
+        futures = [executor.submit(_readf, i) if isinstance(i, str) else None for i in inputs]
+        try:
+            for i, future in zip(inputs, futures):
+                yield _read(i) if future is None else future.result()
+        finally:
+            for future in futures:
+                if future is not None:
+                    future.cancel()
+            if executor is not self._parallel:
+                executor.shutdown(wait=False)
+
+    def _publish(self, conf: dict, changes: dict = None, touched: dict = None):
+        """Replaces the configuration by a new one. The index is built before
+        the configuration is swapped, hence readers never see a half-built
+        configuration. The configuration may not be modified after it is
+        published.
+
+        :param conf: New configuration
+        :param changes: Changes of the index, it is rebuilt from conf if not given
+        :param touched: Nested dictionary of the changed keys, if only those
+            need to be validated
+        :raises ValueError: Raised if the configuration does not match the schema
+        """
+        conf = self._validate(conf, changes, touched)
+
+        if self._index is not None:
+            if changes is None:
+                self._index = FlatIndex(flatten(conf, self._seperator))
+            else:
+                self._index = self._index.patch(changes)
+        self._conf = conf
+        self._misses = set()
+
+    def _validate(self, conf: dict, changes: dict = None, touched: dict = None) -> dict:
+        """Validates a configuration with the schema and converts its values.
+        Without a schema, the configuration is returned as it is.
+
+        :param conf: Configuration to validate
+        :param changes: Changes of the index, are updated with the conversions
+        :param touched: Nested dictionary of the changed keys, default all
+        :raises ValueError: Raised if the configuration does not match the schema
+        :return: the configuration with converted values
+        """
+        if self._schema is None:
+            return conf
+
+        patch = self._schema.validate(conf, self._pending, touched)
+        if not patch:
+            return conf
+
+        conf = merge(conf, patch)
+        if changes is not None and self._index is not None:
+            self._patch_index(changes, conf, patch)
+        return conf
+
+    def _convert(self, layer: dict) -> dict:
+        """Validates the values of an override layer with the schema and
+        converts them. Only the keys of the layer are validated. Without a
+        schema, the layer is returned as it is.
+
+        :param layer: Nested override layer
+        :raises ValueError: Raised if the layer does not match the schema
+        :return: the layer with converted values
+        """
+        if self._schema is None:
+            return layer
+
+        patch = self._schema.validate(layer, within=layer)
+        return merge(layer, patch) if patch else layer
+
+    def _active_overrides(self) -> tuple:
+        """Collects the override layers, which are visible in the current
+        context, highest priority first.
+
+        :return: tuple of the override layers
+        """
+        if self._scoped:
+            return _scopes.get().get(self, ()) + self._overrides
+        return self._overrides
+
+    def _resolve(self, overrides: tuple, key: str, default: Any) -> Any:
+        """Looks up a key in the override layers and the configuration.
+
+        :param overrides: Override layers, highest priority first
+        :param key: Requested key in dot-notation
+        :param default: Default value to return
+        :return: Value of the requested key
+        """
+        val = resolve(overrides + (self._conf,), key, self._seperator)
+        if val is None:
+            return default
+        return wrap(val, self._seperator)
+
+    def _changed_keys(self, conf: dict, changed: List[tuple]) -> List[str]:
+        """Determines which keys differ between the current and the given
+        configuration. Only the keys of the changed inputs are compared.
+
+        :param conf: New configuration
+        :param changed: Tuples of old and new content of the changed inputs
+        :return: list of changed keys in dot-notation
+        """
+        keys = dict()
+
+        for old, new in changed:
+            for layer in (old, new):
+                for k, v in flatten(layer, self._seperator).items():
+                    if isinstance(v, dict) and v:
+                        continue
+                    before = lookup(self._conf, k, self._seperator, _MISSING)
+                    after = lookup(conf, k, self._seperator, _MISSING)
+                    if before != after:
+                        keys[k] = None
+
+        return list(keys)
+
+    def _patch_index(self, changes: dict, conf: dict, other: dict):
+        """Collects the changes of the flat index after `other` was merged
+        into the configuration. Only the keys of `other` are touched, hence
+        the cost is proportional to the size of `other` and not to the
+        configuration.
+
+        :param changes: Changes of the index so far, is updated
+        :param conf: Configuration after the merge
+        :param other: Dictionary which was merged into the configuration
+        """
+        sep = self._seperator
+        queue = deque([("", other, conf)])
+
+        while queue:
+            prefix, section, merged = queue.popleft()
+            for k, v in section.items():
+                key = f"{prefix}{k}"
+                val = merged[k]
+                old = changes.get(key, _MISSING)
+                if old is _MISSING:
+                    old = self._index.get(key)
+                if isinstance(old, dict) and not isinstance(val, dict):
+                    # Section was replaced by a value, drop its keys
+                    for sub in flatten(old, sep):
+                        changes[f"{key}{sep}{sub}"] = DELETED
+                changes[key] = val
+                if isinstance(v, dict) and v:
+                    queue.append((f"{key}{sep}", v, val))
+
+
+class Batch:
+    """Collects changes of a configuration, which are applied at once. See
+    `Configuration.batch`.
+    """
+
+    def __init__(self, seperator: str):
+        """Creates a new, empty batch.
+
+        :param seperator: Seperator character used for the dot-notation
+        """
+        self.patches = [dict()]
+        self._seperator = seperator
+
+    def set(self, key: str, val: Any):
+        """Sets a value of a configuration option, once the batch is applied.
+
+        :param key: Key in dot-notation
+        :param val: New value
+        """
+        change = {key: val}
+        if replaces(self.patches[-1], change, self._seperator):
+            # The value, which was set before, is replaced by a section
+            self.patches.append(dict())
+        unflatten(change, self._seperator, self.patches[-1])
+
+
+def _read(i: Any) -> dict:
+    """Reads a single configuration input.
+
+    :param i: Input to read, either a dictionary, a file path or a source
+    :return: the content of the input, or a function of the configuration
+        merged so far, see `Source.read`
+    """
+    if isinstance(i, dict):
+        # simply a dictionary
+        return i
+    elif isinstance(i, str):
+        # assume it is a path to a file
+        return _readf(i)
+    elif isinstance(i, Source):
+        return i.read()
+
+    raise TypeError(f"Cannot load a configuration of type {type(i)}")
+
+
+def _read_records(file_path: str) -> Iterator[dict]:
+    """Reads a file with one JSON record per line, line by line.
+
+    :param file_path: path of the file to read
+    :return: iterator of the records
+    """
+    parse = get_parser(".json").parse
+
+    with open(file_path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield parse(line)
+
+
+def _stamps(file_paths: List[str]) -> List[Optional[tuple]]:
+    """Returns the modification times and sizes of several files.
+
+    :param file_paths: paths of the files
+    :return: list of stamps, see `_stamp`
+    """
+    return [_stamp(p) for p in file_paths]
+
+
+def _stamp(file_path: str) -> Optional[tuple]:
+    """Returns the modification time, size and inode of a file. The inode
+    changes, if a symlink is swapped to another file.
+
+    :param file_path: path of the file
+    :return: tuple of mtime, size and inode, None if the file does not exist
+    """
+    try:
+        st = stat(file_path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
 
 def _readf(file_path: str) -> dict:
     """Reads the content of a configuration file and parses it to a dictionary.
     Raises a FileNotFoundError if the file does not exist.
 
+    Parsed files are cached process-wide, see `yacf.cache.file_cache`.
+
     :param file_path: path of the file to open
     """
     if not path.exists(file_path):
         raise FileNotFoundError(f"File cannot be found: '{file_path}'")
 
-    # Checks which function should be used to load the file
-    fn = [f for ext, f in ACCEPTED_FILE_EXTENSIONS.items() if file_path.endswith(ext)]
+    # Checks which parser should be used to load the file
+    parser = get_parser(file_path)
 
-    if len(fn) < 1:
-        raise NotImplementedError("File extension not supported.")
+    def parse(p: str) -> dict:
+        with open(p, "rb" if parser.binary else "r") as f:
+            content = parser.parse(f.read())
+            assert isinstance(content, dict)
+            return content
 
-    with open(file_path, "r") as f:
-        content = fn[0].__call__(f)
-        assert isinstance(content, dict)
-        return content
+    return file_cache.get(file_path, parse)
@@ -0,0 +1,198 @@
+"""Frozen configurations, made of generated classes with slots.
+"""
+
+# standard lib
+import keyword
+import weakref
+from collections import Counter
+from threading import Lock
+from types import MappingProxyType
+from typing import Any, Iterator, Tuple
+
+# generated classes, by the keys of their sections, released with their instances
+_classes = weakref.WeakValueDictionary()
+_lock = Lock()
+
+# Maximum number of classes per freeze, which are generated for the keys of
+# a single section, and the maximum number of keys of such a section. Other
+# sections with unique keys share one class.
+MAX_UNIQUE_CLASSES = 64
+MAX_UNIQUE_SLOTS = 256
+
+
+class Frozen:
+    """Base class of the generated classes of a frozen configuration. Each
+    section is an instance of a class, which has a slot per key. Reading an
+    attribute is a plain slot access and an instance takes much less memory
+    than a dictionary.
+
+    A frozen section can not be modified. Besides the attribute notation, it
+    supports `section[key]`, `key in section`, iteration over the keys and
+    `len(section)`.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for k, v in zip(self.__slots__, values):
+            object.__setattr__(self, k, v)
+
+    def __setattr__(self, key: str, val: Any):
+        raise AttributeError("A frozen configuration can not be modified")
+
+    def __delattr__(self, key: str):
+        raise AttributeError("A frozen configuration can not be modified")
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Frozen):
+            return NotImplemented
+        return tuple(self) == tuple(other) and all(self[k] == other[k] for k in self)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        items = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"Frozen({items})"
+
+
+class FrozenSection(Frozen):
+    """A frozen section, which keeps its values in a dictionary instead of
+    slots. Sections with keys, which no other section has, share this class,
+    instead of generating a class for each of them, e.g. for a map of many
+    tenants with different keys. It supports the same access patterns.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict):
+        object.__setattr__(self, "_data", data)
+
+    def __getattr__(self, key: str) -> Any:
+        try:
+            return self._data[key]
+        except KeyError:
+            raise AttributeError(f"Frozen section has no attribute '{key}'") from None
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        items = ", ".join(f"{k}={v!r}" for k, v in self._data.items())
+        return f"Frozen({items})"
+
+
+def freeze(d: dict) -> Any:
+    """Freezes a (nested) dictionary. Sections with keys, which are valid
+    attribute names, become instances of generated classes with slots.
+    Other sections become read-only mappings. Lists become tuples.
+
+    Classes are generated once per set of keys and reused, e.g. for the
+    sections of many tenants with the same keys, as long as any section uses
+    them. Only up to `MAX_UNIQUE_CLASSES` sections, whose keys no other
+    section has, get a class of their own, the sections closest to the root
+    first and only if they have at most `MAX_UNIQUE_SLOTS` keys. The others
+    are `FrozenSection` objects. The dictionary is traversed iteratively,
+    hence its depth is not limited by the recursion limit.
+
+    :param d: Dictionary to freeze
+    :return: frozen dictionary
+    """
+    # Sections level by level, they are built in reverse, children first
+    order = [(d, tuple(d))]
+    for section, _ in order:
+        order.extend((v, tuple(v)) for v in section.values() if isinstance(v, dict))
+
+    # Decide which sections get a generated class, closest to the root first
+    shapes = Counter(keys for _, keys in order)
+    budget = MAX_UNIQUE_CLASSES
+    kinds = []
+    for _, keys in order:
+        if not all(_is_attribute(k) for k in keys):
+            kinds.append(MappingProxyType)
+        elif shapes[keys] > 1 or keys in _classes:
+            kinds.append(None)
+        elif budget > 0 and len(keys) <= MAX_UNIQUE_SLOTS:
+            budget -= 1
+            kinds.append(None)
+        else:
+            kinds.append(FrozenSection)
+
+    frozen = dict()
+    for (section, keys), kind in zip(reversed(order), reversed(kinds)):
+        values = [
+            frozen[id(v)] if isinstance(v, dict) else _freeze_value(v) for v in section.values()
+        ]
+        if kind is None:
+            frozen[id(section)] = _class(keys)(*values)
+        else:
+            frozen[id(section)] = kind(dict(zip(keys, values)))
+
+    return frozen[id(d)]
+
+
+def _freeze_value(val: Any) -> Any:
+    """Freezes a value, which is not a section.
+
+    :param val: Value to freeze
+    :return: frozen value
+    """
+    if isinstance(val, (list, tuple)):
+        return tuple(freeze(v) if isinstance(v, dict) else _freeze_value(v) for v in val)
+    if isinstance(val, set):
+        return frozenset(val)
+    if isinstance(val, bytearray):
+        return bytes(val)
+    return val
+
+
+def _is_attribute(key: Any) -> bool:
+    """Checks whether a key can be used as attribute name of a generated
+    class.
+
+    :param key: Key of a section
+    :return: True if the key is a valid attribute name
+    """
+    return (
+        isinstance(key, str)
+        and key.isidentifier()
+        and not keyword.iskeyword(key)
+        and not key.startswith("__")
+    )
+
+
+def _class(keys: Tuple[str, ...]) -> type:
+    """Returns the generated class for a set of keys.
+
+    :param keys: Keys of the section, in order
+    :return: generated class
+    """
+    cls = _classes.get(keys)
+    if cls is None:
+        with _lock:
+            cls = _classes.get(keys)
+            if cls is None:
+                cls = _classes[keys] = type("Frozen", (Frozen,), {"__slots__": keys})
+    return cls
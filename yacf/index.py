@@ -0,0 +1,72 @@
+"""Flat index of a configuration, which maps keys in dot-notation to values.
+"""
+
+# standard lib
+from typing import Any
+
+_MISSING = object()
+
+# marks a key, which was removed from the index
+DELETED = object()
+
+
+class FlatIndex:
+    """An immutable flat index. A new version of the index is created with
+    `patch`, which records the changed keys in a small delta on top of the
+    base dictionary of the previous version. The base is shared, hence
+    patching a large index only costs time proportional to the changed keys.
+
+    As soon as the delta grows larger than the square root of the base, it is
+    folded into a new base. Without a delta, `get` is the plain `dict.get` of
+    the base.
+    """
+
+    __slots__ = ("_base", "_delta", "get")
+
+    def __init__(self, base: dict, delta: dict = None):
+        """Creates a new index. Neither the base nor the delta may be modified
+        afterwards.
+
+        :param base: Dictionary of keys in dot-notation and their values
+        :param delta: Changed keys, removed keys map to `DELETED`
+        """
+        self._base = base
+        self._delta = delta or {}
+        self.get = self._get if self._delta else base.get
+
+    def _get(self, key: str, default: Any = None) -> Any:
+        val = self._delta.get(key, _MISSING)
+        if val is _MISSING:
+            return self._base.get(key, default)
+        return default if val is DELETED else val
+
+    def dict(self) -> dict:
+        """Returns a copy of the index as a dictionary.
+
+        :return: flat dictionary
+        """
+        flat = dict(self._base)
+
+        for k, v in self._delta.items():
+            if v is DELETED:
+                flat.pop(k, None)
+            else:
+                flat[k] = v
+
+        return flat
+
+    def patch(self, changes: dict) -> "FlatIndex":
+        """Creates a new version of the index with the given changes applied.
+        The index itself is not modified.
+
+        :param changes: Changed keys, removed keys map to `DELETED`
+        :return: the new index
+        """
+        if not changes:
+            return self
+
+        delta = {**self._delta, **changes}
+        if len(delta) <= int(len(self._base) ** 0.5):
+            return FlatIndex(self._base, delta)
+
+        return FlatIndex(FlatIndex(self._base, delta).dict())
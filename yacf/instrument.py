@@ -0,0 +1,95 @@
+"""Instrumentation of configuration lookups.
+"""
+
+# standard lib
+import itertools
+from time import perf_counter_ns
+from typing import Any, Callable
+
+
+class _State:
+    """Counters of an instrument, replaced as a whole on reset."""
+
+    __slots__ = ("reads", "misses", "buckets", "ticks")
+
+    def __init__(self):
+        self.reads = dict()
+        self.misses = dict()
+        # bucket n counts the latencies below 2**n nanoseconds
+        self.buckets = [0] * 64
+        self.ticks = itertools.count(1)
+
+
+class Instrument:
+    """Records the lookups of a configuration: how often each key is read,
+    how often the default was returned, because the key does not exist, and
+    the latency of every n-th lookup in a histogram.
+
+    The counters are updated without a lock. Under heavy concurrent reads,
+    single increments may get lost, the counts are close but not exact.
+    """
+
+    def __init__(self, sample: int = 100):
+        """Creates a new instrument.
+
+        :param sample: Measure the latency of every n-th lookup, 0 disables it
+        """
+        self.sample = sample
+        self._state = _State()
+
+    def wrap(self, get: Callable, missing: Any) -> Callable:
+        """Wraps a lookup function, to record its calls.
+
+        :param get: Function to look up a key, `get(key, default)`
+        :param missing: Sentinel to detect, that the key does not exist
+        :return: instrumented function with the same signature
+        """
+
+        def instrumented(key: str, default: Any = None) -> Any:
+            state = self._state
+            sampled = self.sample and next(state.ticks) % self.sample == 0
+
+            if sampled:
+                start = perf_counter_ns()
+                val = get(key, missing)
+                state.buckets[min((perf_counter_ns() - start).bit_length(), 63)] += 1
+            else:
+                val = get(key, missing)
+
+            state.reads[key] = state.reads.get(key, 0) + 1
+            if val is missing:
+                state.misses[key] = state.misses.get(key, 0) + 1
+                return default
+            return val
+
+        return instrumented
+
+    def stats(self) -> dict:
+        """Exports the recorded counters. The result can be serialized as
+        JSON, e.g. with `json.dumps`.
+
+        :return: dictionary of the reads and misses per key, and the latency
+            histogram as list of upper bounds in nanoseconds and counts
+        """
+        return self._export(self._state)
+
+    def reset(self) -> dict:
+        """Resets all counters at once, by replacing them with new ones.
+
+        :return: the counters up to the reset, see `stats`
+        """
+        state, self._state = self._state, _State()
+        return self._export(state)
+
+    def _export(self, state: _State) -> dict:
+        buckets = list(state.buckets)
+
+        return {
+            "reads": dict(state.reads),
+            "misses": dict(state.misses),
+            "latency": {
+                "sample": self.sample,
+                "samples": sum(buckets),
+                "buckets": [[2**n, c] for n, c in enumerate(buckets) if c],
+            },
+        }
@@ -0,0 +1,175 @@
+"""Layered views, which resolve keys across several configurations on read.
+"""
+
+# standard lib
+from collections.abc import Mapping
+from typing import Any, Iterator, List, Sequence, Tuple
+
+# first party
+from yacf.section import check_attribute, wrap
+from yacf.utils import flatten, merge
+
+_MISSING = object()
+
+
+class Layered(Mapping):
+    """A read-only view on a stack of (nested) dictionaries, similar to a
+    `collections.ChainMap`, but for nested sections. The dictionaries are
+    not merged. A key is resolved on read, by probing the layers from the
+    highest priority down. The result equals the lookup in the merged
+    dictionaries: a section of a layer is merged with the sections of the
+    lower layers, a value hides the lower layers.
+
+    Pushing or popping a layer creates a new view in constant time and does
+    not copy any layer, e.g. to put small overrides on top of large defaults.
+    """
+
+    __slots__ = ("_layers", "_seperator")
+
+    def __init__(self, *layers: dict, seperator: str = "."):
+        """Creates a new layered view. The first layer has the highest
+        priority. The layers may not be modified afterwards.
+
+        :param *layers: Dictionaries to resolve keys in, highest priority first
+        :param seperator: Seperator character to use for the dot-notation
+        """
+        self._layers = layers
+        self._seperator = seperator
+
+    def __getattr__(self, key: str) -> Any:
+        """Gets an attribute of the view. Behaves just as the attribute
+        notation of the `Configuration` class.
+
+        :param key: Name of the attribute to look up
+        :raises AttributeError: Raised if attribute does not exist.
+        :return: Value of the attribute
+        """
+        check_attribute(key, self._seperator)
+
+        val = resolve(self._layers, key, self._seperator, _MISSING)
+        if val is _MISSING:
+            raise AttributeError(f"Layered view has no attribute '{key}'")
+        return wrap(val, self._seperator)
+
+    def __getitem__(self, key: str) -> Any:
+        val = resolve(self._layers, key, self._seperator, _MISSING)
+        if val is _MISSING:
+            raise KeyError(key)
+        return wrap(val, self._seperator)
+
+    def __iter__(self) -> Iterator[str]:
+        keys = dict()
+        for layer in self._layers:
+            keys.update(dict.fromkeys(layer))
+        return iter(keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"Layered({', '.join(repr(layer) for layer in self._layers)})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Resolves a key in dot-notation. Sections, which exist in several
+        layers, are returned as layered views again, sections of a single
+        layer as `Section` views.
+
+        :param key: The key to look for.
+        :param default: The default value to return to.
+        :return: Value of the requested key.
+        """
+        val = resolve(self._layers, key, self._seperator)
+        if val is None:
+            return default
+        return wrap(val, self._seperator)
+
+    def push(self, layer: dict) -> "Layered":
+        """Creates a new view with an additional layer on top.
+
+        :param layer: Dictionary with the highest priority
+        :return: the new view
+        """
+        return Layered(layer, *self._layers, seperator=self._seperator)
+
+    def pop(self) -> "Layered":
+        """Creates a new view without the top layer.
+
+        :return: the new view
+        """
+        return Layered(*self._layers[1:], seperator=self._seperator)
+
+    def merged(self) -> dict:
+        """Merges the layers to a single dictionary.
+
+        :return: merged dictionary
+        """
+        conf = dict()
+        for layer in reversed(self._layers):
+            conf = merge(conf, layer)
+        return conf
+
+    def dict(self) -> dict:
+        """Convert the view to a dictionary, just as `Configuration.dict()`
+        does. The layers are merged to do so.
+
+        :return: generated dict
+        """
+        return flatten(self.merged(), self._seperator)
+
+
+def resolve(layers: Sequence[dict], key: str, seperator: str, missing: Any = None) -> Any:
+    """Resolves a key in dot-notation in a stack of dictionaries, as if they
+    were merged. Just as `yacf.utils.find`, a key which exists literally in a
+    section takes precedence over its dot-notation and a value which is
+    `None` is returned as `None`. The keys of sections are resolved one after
+    another, in all layers, which contain a section at this point. If several
+    layers contain the requested section, a layered view of them is returned.
+
+    :param layers: Dictionaries, highest priority first
+    :param key: Requested key in dot-notation
+    :param seperator: Seperating character of the dot-notation
+    :param missing: Value to return, if the key does not exist
+    :return: the value, the section or a layered view of the sections
+    """
+    nodes = layers
+
+    while True:
+        val, sections = _probe(nodes, key)
+        if val is not _MISSING:
+            return val
+        if sections:
+            return Layered(*sections, seperator=seperator) if len(sections) > 1 else sections[0]
+
+        if seperator not in key:
+            return missing
+
+        k, key = key.split(seperator, 1)
+        _, nodes = _probe(nodes, k)
+        if not nodes:
+            # The key is missing or a value, which has no subkeys
+            return missing
+
+
+def _probe(nodes: Sequence[dict], key: str) -> Tuple[Any, List[dict]]:
+    """Looks up a key literally in the sections of several layers.
+
+    :param nodes: Sections, highest priority first
+    :param key: Key to look up
+    :return: tuple of the value and an empty list, or of a sentinel and the
+        sections, which are stored at the key, highest priority first
+    """
+    sections = []
+    for node in nodes:
+        val = node.get(key, _MISSING)
+        if val is _MISSING:
+            continue
+        if isinstance(val, dict):
+            sections.append(val)
+            continue
+        if sections:
+            # The value is hidden by the sections above
+            break
+        # The value hides the layers below
+        return val, sections
+
+    return _MISSING, sections
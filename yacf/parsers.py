@@ -0,0 +1,119 @@
+"""Registry of the parsers for the supported file types.
+
+For each file extension, the fastest installed backend is selected:
+
+* json: `orjson`, falls back to the standard library `json`
+* toml: `tomllib` (Python 3.11+), `tomli` and finally `toml`
+
+Backends, which support it, parse the raw bytes of a file, which saves the
+decoding to a string.
+"""
+
+# standard lib
+import io
+from collections import namedtuple
+from importlib import import_module
+from typing import Callable, Dict, List, Union
+
+Parser = namedtuple("Parser", ["name", "parse", "binary"])
+Parser.__doc__ = """A parser backend for one file type.
+
+:param name: Name of the backend
+:param parse: Function to parse the content of a file to a dictionary
+:param binary: Whether parse takes bytes instead of a string
+"""
+
+# Candidate backends per file extension, in order of preference
+# (module, function, binary)
+BACKENDS = {
+    ".json": [("orjson", "loads", True), ("json", "loads", True)],
+    ".toml": [("tomllib", "loads", False), ("tomli", "loads", False), ("toml", "loads", False)],
+}
+
+# Selected parser per file extension. Plain functions, which load a file
+# object like `json.load`, are accepted as well.
+PARSERS: Dict[str, Union[Parser, Callable]] = {}
+
+
+def available(ext: str) -> List[Parser]:
+    """Returns all installed backends for a file extension, in order of
+    preference.
+
+    :param ext: File extension, e.g. ".json"
+    :return: list of parsers
+    """
+    parsers = []
+
+    for module, fn, binary in BACKENDS.get(ext, []):
+        try:
+            parse = getattr(import_module(module), fn)
+        except ImportError:
+            continue
+        parsers.append(Parser(module, parse, binary))
+
+    return parsers
+
+
+def register(ext: str, parse: Callable, binary: bool = False, name: str = None):
+    """Registers a parser for a file extension. An already registered parser
+    for the extension is replaced.
+
+    :param ext: File extension, e.g. ".json"
+    :param parse: Function to parse the content of a file to a dictionary
+    :param binary: Whether parse takes bytes instead of a string
+    :param name: Name of the backend
+    """
+    PARSERS[ext] = Parser(name or getattr(parse, "__module__", "custom"), parse, binary)
+
+
+def select(ext: str, name: str):
+    """Selects one of the installed backends for a file extension.
+
+    :param ext: File extension, e.g. ".json"
+    :param name: Name of the backend, e.g. "json"
+    :raises ImportError: Raised if the backend is not installed
+    """
+    for parser in available(ext):
+        if parser.name == name:
+            PARSERS[ext] = parser
+            return
+    raise ImportError(f"Parser backend '{name}' for '{ext}' files is not installed")
+
+
+def get_parser(file_path: str) -> Parser:
+    """Returns the parser for a file, based on its extension.
+
+    :param file_path: Path of the file to parse
+    :raises NotImplementedError: Raised if the file extension is not supported
+    :return: parser
+    """
+    for ext, parser in PARSERS.items():
+        if file_path.endswith(ext):
+            if not isinstance(parser, Parser):
+                # A loader of older versions, which reads from a file object
+                return _loader(parser)
+            return parser
+
+    raise NotImplementedError("File extension not supported.")
+
+
+def _loader(load: Callable) -> Parser:
+    """Wraps a loader, which parses a file object, e.g. `json.load`, as
+    parser of the content of a file.
+
+    :param load: Function to parse a file object to a dictionary
+    :return: parser
+    """
+
+    def parse(content: Union[str, bytes]) -> dict:
+        if isinstance(content, bytes):
+            content = content.decode()
+        return load(io.StringIO(content))
+
+    return Parser(getattr(load, "__module__", None) or "custom", parse, False)
+
+
+for _ext in BACKENDS:
+    _parsers = available(_ext)
+    if _parsers:
+        PARSERS[_ext] = _parsers[0]
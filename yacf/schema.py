@@ -0,0 +1,334 @@
+"""Schemas, which validate a configuration and convert its values.
+
+A schema is either a dataclass or a dictionary. The fields of a dataclass or
+the values of a dictionary are types or converters, nested dataclasses and
+dictionaries describe sections:
+
+```
+@dataclass
+class Api:
+    hostname: str
+    port: int = 80
+    timeout: float = field(default=30.0, metadata={"convert": "duration"})
+
+schema = {"api": {"hostname": str, "port": (int, 80), "max_body": "bytesize"}}
+```
+
+Supported types are `int`, `float`, `bool`, `str`, `list` and `List[...]`,
+`Optional[...]` and `Any`. The converters `duration` and `bytesize` convert
+strings like `1h30m` to seconds and `10MiB` to bytes. Any other callable is
+used as converter on its own. In a dictionary, a tuple of a type and a value
+defines the default value. Keys without a default value are required.
+"""
+
+# standard lib
+import dataclasses
+import re
+import typing
+from typing import Any, Callable, List, Tuple
+
+# first party
+from yacf.utils import same
+
+_MISSING = object()
+
+_TRUE = ("true", "1", "yes", "on")
+_FALSE = ("false", "0", "no", "off")
+
+_DURATION = re.compile(r"(\d+(?:\.\d*)?|\.\d+)\s*(ms|s|m|h|d|w)", re.IGNORECASE)
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+_BYTESIZE = re.compile(r"(\d+(?:\.\d*)?|\.\d+)\s*([kmgtp]?)(i?)b?", re.IGNORECASE)
+_BYTESIZE_EXP = {"": 0, "k": 1, "m": 2, "g": 3, "t": 4, "p": 5}
+
+
+def to_int(val: Any) -> int:
+    """Converts integers and strings of integers.
+
+    :param val: Value to convert
+    :raises ValueError: Raised if the value is not an integer
+    :return: the integer
+    """
+    if isinstance(val, int) and not isinstance(val, bool):
+        return val
+    if isinstance(val, str):
+        return int(val)
+    raise ValueError(f"expected an integer, got {val!r}")
+
+
+def to_float(val: Any) -> float:
+    """Converts numbers and strings of numbers.
+
+    :param val: Value to convert
+    :raises ValueError: Raised if the value is not a number
+    :return: the number as float
+    """
+    if isinstance(val, (int, float, str)) and not isinstance(val, bool):
+        return float(val)
+    raise ValueError(f"expected a number, got {val!r}")
+
+
+def to_bool(val: Any) -> bool:
+    """Converts booleans and strings like `true`, `no` or `1`.
+
+    :param val: Value to convert
+    :raises ValueError: Raised if the value is not a boolean
+    :return: the boolean
+    """
+    if isinstance(val, bool):
+        return val
+    if isinstance(val, str) and val.lower() in _TRUE + _FALSE:
+        return val.lower() in _TRUE
+    raise ValueError(f"expected a boolean, got {val!r}")
+
+
+def to_str(val: Any) -> str:
+    """Converts strings and numbers.
+
+    :param val: Value to convert
+    :raises ValueError: Raised if the value is no string or number
+    :return: the string
+    """
+    if isinstance(val, str):
+        return val
+    if isinstance(val, (int, float)) and not isinstance(val, bool):
+        return str(val)
+    raise ValueError(f"expected a string, got {val!r}")
+
+
+def to_duration(val: Any) -> float:
+    """Converts durations like `1h30m`, `250ms` or `2.5s` to seconds. Numbers
+    are seconds already.
+
+    :param val: Value to convert
+    :raises ValueError: Raised if the value is not a duration
+    :return: duration in seconds
+    """
+    if isinstance(val, (int, float)) and not isinstance(val, bool):
+        return float(val)
+    if not isinstance(val, str):
+        raise ValueError(f"expected a duration, got {val!r}")
+
+    text = val.replace(" ", "")
+    parts = _DURATION.findall(text)
+    if not parts or "".join(n + u for n, u in parts) != text:
+        try:
+            return float(val)
+        except ValueError:
+            raise ValueError(f"expected a duration, got {val!r}") from None
+
+    return sum(float(n) * _DURATION_UNITS[u.lower()] for n, u in parts)
+
+
+def to_bytesize(val: Any) -> int:
+    """Converts sizes like `512`, `10MB` or `1.5GiB` to bytes. `KB` is 1000
+    bytes, `KiB` and `K` are 1024 bytes.
+
+    :param val: Value to convert
+    :raises ValueError: Raised if the value is not a size
+    :return: size in bytes
+    """
+    if isinstance(val, int) and not isinstance(val, bool):
+        return val
+    if not isinstance(val, str):
+        raise ValueError(f"expected a size, got {val!r}")
+
+    match = _BYTESIZE.fullmatch(val.strip())
+    if match is None:
+        raise ValueError(f"expected a size, got {val!r}")
+
+    n, unit, binary = match.groups()
+    unit = unit.lower()
+    base = 1024 if binary or (unit and not val.strip().lower().endswith("b")) else 1000
+    return int(float(n) * base ** _BYTESIZE_EXP[unit])
+
+
+CONVERTERS = {
+    int: to_int,
+    float: to_float,
+    bool: to_bool,
+    str: to_str,
+    "duration": to_duration,
+    "bytesize": to_bytesize,
+}
+
+
+class Schema:
+    """A compiled schema. All fields of the schema are resolved to their
+    converters, when the schema is created. The compiled schema is a tree of
+    the sections, which is walked along the configuration, hence each section
+    is looked up once. See the module documentation for the format of the
+    specification.
+    """
+
+    def __init__(self, spec: Any, seperator: str = "."):
+        """Compiles a schema.
+
+        :param spec: Dataclass or dictionary, which describes the configuration
+        :param seperator: Seperator character used for the dot-notation
+        :raises TypeError: Raised if the specification contains unknown types
+        """
+        self.spec = spec
+        self._seperator = seperator
+        self._converters = dict()
+        self._tree = self._compile(spec)
+
+    def validate(self, conf: dict, skip: frozenset = frozenset(), within: dict = None) -> dict:
+        """Validates a configuration and converts its values. The
+        configuration itself is not modified.
+
+        If only a part of the configuration changed, e.g. by setting a value,
+        the validation can be limited to the changed keys.
+
+        :param conf: Configuration to validate
+        :param skip: Top-level keys, which are not validated
+        :param within: Nested dictionary of the keys to validate, default all
+        :raises ValueError: Raised if a value is missing or cannot be converted
+        :return: nested dictionary of the values, which changed on conversion
+        """
+        patch = dict()
+        stack = [((), {k: v for k, v in self._tree.items() if k not in skip}, conf, within)]
+
+        while stack:
+            path, tree, section, within = stack.pop()
+            changed = dict()
+
+            for k, field in tree.items():
+                if within is not None and k not in within:
+                    continue
+                raw = None if section is None else section.get(k)
+
+                if type(field) is dict:
+                    sub = within[k] if within is not None and isinstance(within[k], dict) else None
+                    stack.append((path + (k,), field, raw if isinstance(raw, dict) else None, sub))
+                    continue
+
+                convert, default = field
+                if raw is None:
+                    if default is _MISSING:
+                        raise ValueError(f"Missing configuration key '{self._key(path, k)}'")
+                    val = default
+                else:
+                    try:
+                        val = convert(raw)
+                    except (TypeError, ValueError) as e:
+                        raise ValueError(f"Invalid value of '{self._key(path, k)}': {e}") from None
+
+                if not same(val, raw):
+                    changed[k] = val
+
+            if changed:
+                node = patch
+                for k in path:
+                    node = node.setdefault(k, {})
+                node.update(changed)
+
+        return patch
+
+    def _key(self, path: Tuple[str, ...], key: str) -> str:
+        return self._seperator.join(path + (key,))
+
+    def _compile(self, spec: Any) -> dict:
+        """Compiles a (nested) specification to a tree of sections, which map
+        the keys to their converter and default value.
+
+        :param spec: Dataclass or dictionary
+        :return: compiled section
+        """
+        if dataclasses.is_dataclass(spec):
+            hints = typing.get_type_hints(spec)
+            fields = []
+            for f in dataclasses.fields(spec):
+                if f.default is not dataclasses.MISSING:
+                    default = f.default
+                elif f.default_factory is not dataclasses.MISSING:
+                    default = f.default_factory()
+                else:
+                    default = _MISSING
+                fields.append((f.name, f.metadata.get("convert", hints[f.name]), default))
+        else:
+            fields = []
+            for k, v in spec.items():
+                v, default = v if isinstance(v, tuple) else (v, _MISSING)
+                fields.append((k, v, default))
+
+        tree = dict()
+        for k, tp, default in fields:
+            if dataclasses.is_dataclass(tp) or isinstance(tp, dict):
+                tree[k] = self._compile(tp)
+                continue
+
+            convert, optional = self._converter(tp)
+            tree[k] = (convert, None if optional and default is _MISSING else default)
+
+        return tree
+
+    def _converter(self, tp: Any) -> Tuple[Callable[[Any], Any], bool]:
+        """Resolves the converter of a type, converters are reused for equal
+        types.
+
+        :param tp: Type or converter
+        :return: tuple of the converter and whether the value is optional
+        """
+        try:
+            return self._converters[tp]
+        except TypeError:
+            return _converter(tp)
+        except KeyError:
+            pass
+
+        self._converters[tp] = _converter(tp)
+        return self._converters[tp]
+
+
+def _converter(tp: Any) -> Tuple[Callable[[Any], Any], bool]:
+    """Resolves the converter of a type.
+
+    :param tp: Type or converter
+    :raises TypeError: Raised if the type is not supported
+    :return: tuple of the converter and whether the value is optional
+    """
+    origin, args = getattr(tp, "__origin__", None), getattr(tp, "__args__", None) or ()
+    # the bare `typing.List` has a type variable as argument
+    args = tuple(a for a in args if not isinstance(a, typing.TypeVar))
+
+    if origin is typing.Union and type(None) in args:
+        args = [a for a in args if a is not type(None)]
+        if len(args) != 1:
+            raise TypeError(f"Unsupported type in schema: {tp}")
+        return _converter(args[0])[0], True
+
+    if tp is list or origin is list:
+        return _list(_converter(args[0] if args else Any)[0]), False
+
+    if isinstance(tp, list):
+        return _list(_converter(tp[0] if tp else Any)[0]), False
+
+    if tp is Any:
+        return _identity, False
+
+    if tp in CONVERTERS:
+        return CONVERTERS[tp], False
+
+    if callable(tp) and not isinstance(tp, str):
+        return tp, False
+
+    raise TypeError(f"Unsupported type in schema: {tp}")
+
+
+def _list(convert: Callable[[Any], Any]) -> Callable[[list], list]:
+    """Builds the converter of a list.
+
+    :param convert: Converter of the items
+    :return: converter of the list
+    """
+
+    def to_list(val: Any) -> List[Any]:
+        if not isinstance(val, (list, tuple)):
+            raise ValueError(f"expected a list, got {val!r}")
+        return [convert(v) for v in val]
+
+    return to_list
+
+
+def _identity(val: Any) -> Any:
+    return val
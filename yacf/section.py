@@ -0,0 +1,178 @@
+"""Read-only section views on top of the configuration storage.
+"""
+
+# standard lib
+from collections.abc import Mapping
+from typing import Any, Iterator
+
+# first party
+from yacf.utils import find, flatten, iter_flat, lookup
+
+_MISSING = object()
+
+
+class Section(Mapping):
+    """A Section is a lightweight, read-only view on a (sub)section of a
+    configuration. It does not copy any data, but shares the storage of the
+    configuration it originates from. Hence, creating a section is cheap and
+    the cost of a lookup does not depend on the size of the section.
+
+    A section supports the same access patterns as the configuration itself:
+    regular `.get()` calls, the dot-notation and the attribute notation.
+    Nested sections are returned as sections again.
+
+    If the configuration maintains a flat index, the section resolves its keys
+    through the index as well, prefixed with the path of the section.
+    """
+
+    __slots__ = ("_data", "_seperator", "_index", "_prefix")
+
+    def __init__(self, data: dict, seperator: str = ".", index: dict = None, prefix: str = ""):
+        """Creates a new view on the given dictionary.
+
+        :param data: Dictionary the section refers to
+        :param seperator: Seperator character to use for the dot-notation
+        :param index: Flat index of the configuration, if available
+        :param prefix: Path of the section in dot-notation, incl. seperator
+        """
+        self._data = data
+        self._seperator = seperator
+        self._index = index
+        self._prefix = prefix
+
+    def __getattr__(self, key: str) -> Any:
+        """Gets an attribute of the section. Behaves just as the attribute
+        notation of the `Configuration` class, a key stored as `None` returns
+        `None`.
+
+        :param key: Name of the attribute to look up
+        :raises AttributeError: Raised if attribute does not exist.
+        :return: Value of the attribute
+        """
+        check_attribute(key, self._seperator)
+
+        val = self.get(key, _MISSING)
+        if val is not _MISSING:
+            return val
+
+        if find(self._data, key, ".", _MISSING) is None:
+            return None
+
+        raise AttributeError(f"Section has no attribute '{key}'")
+
+    def __getitem__(self, key: str) -> Any:
+        # A key stored as None exists, other than for get()
+        path = self._prefix + key
+        if self._index is not None:
+            val = self._index.get(path, _MISSING)
+        else:
+            val = find(self._data, key, self._seperator, _MISSING)
+
+        if val is _MISSING:
+            raise KeyError(key)
+        return wrap(val, self._seperator, self._index, path)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"Section({self._data!r})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Tries to find the key in the section and returns the value, if it
+        exists. Non-empty subsections are returned as `Section` views.
+
+        :param key: The key to look for.
+        :param default: The default value to return to.
+        :return: Value of the requested key.
+        """
+        if self._index is not None:
+            path = self._prefix + key
+            val = self._index.get(path)
+            return default if val is None else wrap(val, self._seperator, self._index, path)
+
+        return wrap(lookup(self._data, key, self._seperator, default), self._seperator)
+
+    def dict(self, lazy: bool = False) -> Mapping:
+        """Convert the section to a dictionary, just as `Configuration.dict()`
+        does. The shared storage is not modified.
+
+        :param lazy: Return a lazy `FlatView` instead of building a dict
+        :return: generated dict
+        """
+        if lazy:
+            return FlatView(self._data, self._seperator)
+        return flatten(self._data, self._seperator)
+
+
+class FlatView(Mapping):
+    """A lazy, read-only mapping of all keys of a (nested) dictionary in
+    dot-notation. Other than a flattened dictionary, it is created in constant
+    time. Keys are resolved on access, iterating the view walks the nested
+    dictionary.
+    """
+
+    __slots__ = ("_data", "_seperator")
+
+    def __init__(self, data: dict, seperator: str = "."):
+        """Creates a new flat view on the given dictionary.
+
+        :param data: Dictionary the view refers to
+        :param seperator: Seperator character to use for the dot-notation
+        """
+        self._data = data
+        self._seperator = seperator
+
+    def __getitem__(self, key: str) -> Any:
+        val = find(self._data, key, self._seperator, _MISSING)
+        if val is _MISSING:
+            raise KeyError(key)
+        return val
+
+    def __iter__(self) -> Iterator[str]:
+        return (k for k, _ in iter_flat(self._data, self._seperator))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"FlatView({self._data!r})"
+
+
+def check_attribute(key: str, seperator: str):
+    """Checks whether an attribute can be looked up as configuration key.
+    Protocol lookups like `__deepcopy__` are never mistaken for keys, and
+    the attribute notation requires the default seperator `.`.
+
+    :param key: Name of the attribute
+    :param seperator: Seperator character of the configuration
+    :raises AttributeError: Raised if the attribute is no configuration key
+    """
+    if key.startswith("__"):
+        raise AttributeError(key)
+
+    if seperator != ".":
+        raise AttributeError(
+            "Attribute notation can not be used if seperator is not the default `.`"
+        )
+
+
+def wrap(val: Any, seperator: str, index: dict = None, path: str = "") -> Any:
+    """Wraps non-empty dictionaries in a `Section` view and returns any other
+    value unchanged.
+
+    :param val: Value to wrap
+    :param seperator: Seperator character to use for the dot-notation
+    :param index: Flat index of the configuration, if available
+    :param path: Path of the value in dot-notation, required for the index
+    :return: Section view or the value itself
+    """
+    if isinstance(val, dict) and val:
+        # Non empty dict
+        if index is None:
+            return Section(val, seperator)
+        return Section(val, seperator, index, path + seperator)
+    return val
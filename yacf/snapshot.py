@@ -0,0 +1,97 @@
+"""Binary snapshots of merged configurations.
+
+A snapshot stores a fully merged configuration together with a fingerprint
+of its inputs: the modification time and size of each file, a hash of each
+dictionary and the fingerprint of each source. As long as the fingerprint
+matches, the configuration can be restored from the snapshot with a single
+file read, no file is parsed and nothing is merged.
+
+Snapshots are serialized with `marshal`. Configurations containing values,
+which `marshal` does not support (e.g. TOML dates), are serialized with
+`pickle`. Only load snapshots written by your own application.
+"""
+
+# standard lib
+import hashlib
+import marshal
+import os
+import pickle
+import sys
+from typing import Optional
+
+# first party
+from yacf.sources import Source
+
+_MAGIC = b"YACF"
+_MARSHAL = b"M"
+_PICKLE = b"P"
+
+
+def fingerprint(inputs: list) -> Optional[tuple]:
+    """Builds the fingerprint of configuration inputs.
+
+    :param inputs: Inputs of a configuration, files, dictionaries or sources
+    :return: fingerprint, None if an input cannot be fingerprinted
+    """
+    fp = [sys.version_info[:2], marshal.version]
+
+    for i in inputs:
+        if isinstance(i, str):
+            try:
+                st = os.stat(i)
+            except OSError:
+                return None
+            fp.append((os.path.abspath(i), st.st_mtime_ns, st.st_size))
+        elif isinstance(i, dict):
+            fp.append(hashlib.sha1(repr(i).encode()).hexdigest())
+        elif isinstance(i, Source) and i.fingerprint() is not None:
+            fp.append((type(i).__name__, i.fingerprint()))
+        else:
+            return None
+
+    return tuple(fp)
+
+
+def read(file_path: str, fp: tuple) -> Optional[dict]:
+    """Reads a snapshot, if it matches the fingerprint.
+
+    :param file_path: Path of the snapshot
+    :param fp: Expected fingerprint
+    :return: the configuration, None if the snapshot is missing or outdated
+    """
+    try:
+        with open(file_path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    if data[: len(_MAGIC)] != _MAGIC:
+        return None
+
+    fmt, payload = data[len(_MAGIC) : len(_MAGIC) + 1], data[len(_MAGIC) + 1 :]
+    try:
+        snapshot_fp, conf = marshal.loads(payload) if fmt == _MARSHAL else pickle.loads(payload)
+    except Exception:
+        return None
+
+    return conf if snapshot_fp == fp else None
+
+
+def write(file_path: str, fp: tuple, conf: dict):
+    """Writes a snapshot. The file is replaced atomically, hence concurrent
+    readers never see a partially written snapshot.
+
+    :param file_path: Path of the snapshot
+    :param fp: Fingerprint of the inputs
+    :param conf: Merged configuration
+    """
+    try:
+        data = _MAGIC + _MARSHAL + marshal.dumps((fp, conf))
+    except ValueError:
+        # unmarshallable values, e.g. datetime objects
+        data = _MAGIC + _PICKLE + pickle.dumps((fp, conf), protocol=pickle.HIGHEST_PROTOCOL)
+
+    tmp = f"{file_path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, file_path)
@@ -0,0 +1,500 @@
+"""Configuration sources other than dictionaries and files.
+"""
+
+# standard lib
+import hashlib
+import mmap
+import os
+import re
+import sys
+from collections.abc import Mapping
+from json import loads as json_loads
+from threading import Lock
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
+
+# first party
+from yacf.parsers import get_parser
+from yacf.utils import lookup, unflatten
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_BRACKETS = re.compile(rb"[{}\[\]]")
+_STRUCTURE = re.compile(rb'["{}\[\]]')
+_STRING_END = re.compile(rb'["\\]')
+_SCALAR_END = re.compile(rb"[,}\]\s]")
+_TRUE = ("true", "1", "yes", "on")
+_FALSE = ("false", "0", "no", "off")
+_NUMBER = re.compile(r"[+-]?(?:\d[\d_]*)?\.?\d[\d_]*(?:[eE][+-]?\d+)?")
+# e.g. file modes like 0644, which are no decimal numbers
+_LEADING_ZERO = re.compile(r"[+-]?0[\d_]")
+
+# parsed environment variables, by prefix, seperator and the raw variables
+_env_cache = dict()
+
+
+class Source:
+    """Base class of configuration sources. A source can be passed to a
+    `Configuration` just like dictionaries and files. When the configuration
+    is loaded, it calls `read()` to get the content of the source.
+    """
+
+    def read(self) -> Union[Mapping, Callable[[dict], Mapping]]:
+        """Reads the content of the source. If the content depends on the
+        inputs before the source, a function can be returned instead. It is
+        called with the configuration merged so far and returns the content.
+
+        :return: content of the source
+        """
+        raise NotImplementedError()
+
+    def fingerprint(self) -> Optional[Any]:
+        """Returns a fingerprint of the content, which changes whenever the
+        content changes. Sources with a fingerprint can be restored from a
+        snapshot, see `Configuration.compile`.
+
+        :return: hashable fingerprint, None if not supported
+        """
+        return None
+
+    def close(self):
+        """Releases the resources of the source, e.g. open files. The
+        configuration closes its sources, as soon as it does not need them
+        anymore.
+        """
+
+
+class LazyJSON(Source, Mapping):
+    """A lazy source for large JSON files. The file is memory-mapped and only
+    the offsets of the top-level sections are indexed, when the source is
+    read. A section is parsed on its first access, hence the resident memory
+    only grows with the sections which are actually used.
+
+    The configuration merges a lazy source section by section, whenever a key
+    of a section is looked up for the first time. As soon as all sections are
+    merged, the configuration closes the source. The source can be used as a
+    context manager, to close it on its own.
+    """
+
+    def __init__(self, file_path: str):
+        """Creates a new lazy source. The file is opened on the first read.
+
+        :param file_path: Path of the JSON file
+        """
+        self.file_path = file_path
+        self._parse = get_parser(".json").parse
+        self._mm = None
+        self._offsets = None
+        self._sections = dict()
+        self._lock = Lock()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._sections[key]
+        except KeyError:
+            pass
+
+        start, end = self._index()[key]
+        with self._lock:
+            if key not in self._sections:
+                if self._mm is None:
+                    raise ValueError(f"Section '{key}' of a closed LazyJSON source")
+                self._sections[key] = self._parse(self._mm[start:end])
+        return self._sections[key]
+
+    def __contains__(self, key: Any) -> bool:
+        # Checks the offsets, without parsing the section
+        return key in self._index()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index())
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def __repr__(self) -> str:
+        return f"LazyJSON({self.file_path!r})"
+
+    def __enter__(self) -> "LazyJSON":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Unmaps the file. Sections, which are parsed already, can still be
+        accessed, others raise a ValueError.
+        """
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+
+    def read(self) -> Mapping:
+        """Indexes the top-level sections of the file.
+
+        :return: the source itself
+        """
+        self._index()
+        return self
+
+    def _index(self) -> dict:
+        """Maps the file and indexes the offsets of the top-level sections.
+
+        :return: dictionary of keys and (start, end) offsets of their values
+        """
+        if self._offsets is not None:
+            return self._offsets
+
+        with self._lock:
+            if self._offsets is None:
+                with open(self.file_path, "rb") as f:
+                    self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._offsets = _index_object(self._mm)
+
+        return self._offsets
+
+
+class Env(Source):
+    """A source of environment variables. Only variables starting with the
+    prefix are read, e.g. with the prefix `APP`, the variable
+    `APP__API__PORT=8080` is mapped to the key `api.port`. Keys are converted
+    to lower case. Values are converted to booleans, numbers, lists or
+    objects, if they look like one, otherwise they stay strings.
+
+    The parsed variables are cached process-wide. As long as the variables
+    with the prefix did not change, reading the source again only checks the
+    names of the environment variables.
+    """
+
+    def __init__(self, prefix: str, seperator: str = "__", lower: bool = True):
+        """Creates a new environment source.
+
+        :param prefix: Prefix of the variables to read, without the seperator
+        :param seperator: Seperator of the prefix and sections in variable names
+        :param lower: Convert the keys to lower case
+        """
+        self.prefix = prefix
+        self.seperator = seperator
+        self.lower = lower
+
+    def __repr__(self) -> str:
+        return f"Env({self.prefix!r})"
+
+    def read(self) -> dict:
+        """Reads the environment variables with the prefix.
+
+        :return: nested dictionary of the variables
+        """
+        variables = self._variables()
+        key = (self.prefix, self.seperator, self.lower)
+
+        cached = _env_cache.get(key)
+        if cached is not None and cached[0] == variables:
+            return cached[1]
+
+        n = len(self.prefix) + len(self.seperator)
+        content = dict()
+        for name, val in sorted(variables):
+            name = name[n:].lower() if self.lower else name[n:]
+            unflatten({name: _coerce(val)}, self.seperator, content)
+
+        _env_cache[key] = (variables, content)
+        return content
+
+    def fingerprint(self) -> str:
+        """Returns a hash of the environment variables with the prefix.
+
+        :return: fingerprint of the variables
+        """
+        return hashlib.sha1(repr(self._variables()).encode()).hexdigest()
+
+    def _variables(self) -> Tuple[Tuple[str, str], ...]:
+        """Returns the environment variables with the prefix. Only the values
+        of matching variables are decoded.
+
+        :return: tuple of names and values, in the order of the environment
+        """
+        start = f"{self.prefix}{self.seperator}"
+        environ = os.environ
+        return tuple((k, environ[k]) for k in environ if k.startswith(start))
+
+
+class Argv(Source):
+    """A source of command line arguments. Each argument of the form
+    `--section.key=value` or `--section.key value` sets a value, a flag without
+    a value, e.g. `--verbose`, is set to `True`. Other arguments are ignored,
+    as well as all arguments after `--`.
+
+    Values are converted to the type of the value they replace, e.g. the
+    argument `--api.port=8080` is an integer, if the port is an integer in the
+    inputs before the source. Keys without such a value are converted like
+    environment variables, see `Env`.
+    """
+
+    def __init__(self, args: List[str] = None, seperator: str = "."):
+        """Creates a new command line source. The arguments are parsed when
+        the source is read.
+
+        :param args: Arguments to parse, defaults to `sys.argv[1:]`
+        :param seperator: Seperator character used for the dot-notation
+        """
+        self.args = sys.argv[1:] if args is None else list(args)
+        self.seperator = seperator
+
+    def __repr__(self) -> str:
+        return f"Argv({self.args!r})"
+
+    def read(self) -> Callable[[dict], dict]:
+        """Parses the arguments.
+
+        :return: function, which converts the arguments based on the
+            configuration merged so far
+        """
+        values = self._parse()
+
+        def resolve(conf: dict) -> dict:
+            sep = self.seperator
+            return unflatten(
+                {k: _coerce_like(v, lookup(conf, k, sep), k) for k, v in values.items()}, sep
+            )
+
+        return resolve
+
+    def fingerprint(self) -> str:
+        """Returns a hash of the arguments.
+
+        :return: fingerprint of the arguments
+        """
+        return hashlib.sha1(repr(self.args).encode()).hexdigest()
+
+    def _parse(self) -> dict:
+        """Collects the options and their values in a single pass.
+
+        :return: dictionary of keys in dot-notation and their raw values
+        """
+        values = dict()
+        args = self.args
+        n = 0
+
+        while n < len(args):
+            arg = args[n]
+            n += 1
+            if arg == "--":
+                break
+            if not arg.startswith("--") or len(arg) == 2:
+                continue
+
+            key, eq, val = arg[2:].partition("=")
+            if not eq:
+                if n < len(args) and not args[n].startswith("--"):
+                    val = args[n]
+                    n += 1
+                else:
+                    val = True
+            values[key] = val
+
+        return values
+
+
+def _coerce_like(val: Union[str, bool], default: Any, key: str) -> Any:
+    """Converts the string value of an argument to the type of the value it
+    replaces.
+
+    :param val: Value to convert, `True` for flags
+    :param default: Value which is replaced, None if there is none
+    :param key: Key of the value, used in error messages
+    :raises ValueError: Raised if the value cannot be converted
+    :return: the converted value
+    """
+    if not isinstance(val, str) or isinstance(default, str):
+        return val
+    if default is None:
+        return _coerce(val)
+
+    if isinstance(default, bool):
+        if val.lower() in _TRUE:
+            return True
+        if val.lower() in _FALSE:
+            return False
+        raise ValueError(f"Expected a boolean for '{key}', got '{val}'")
+
+    if isinstance(default, (int, float)):
+        try:
+            return type(default)(val)
+        except ValueError:
+            raise ValueError(f"Expected {type(default).__name__} for '{key}', got '{val}'") from None
+
+    if isinstance(default, list):
+        if val[:1] == "[":
+            return _coerce(val)
+        item = default[0] if default else None
+        return [_coerce_like(v, item, key) for v in val.split(",")]
+
+    return _coerce(val)
+
+
+def _coerce(val: str) -> Any:
+    """Converts the string value of a variable to the type it looks like.
+    Booleans are `true` or `false`, in any case. Lists and objects are parsed
+    as JSON. Numbers with leading zeros, e.g. `0644`, stay strings.
+
+    :param val: Value to convert
+    :return: the converted value, the string itself if it is nothing else
+    """
+    low = val.lower()
+    if low in ("true", "false"):
+        return low == "true"
+
+    if _NUMBER.fullmatch(val) and not _LEADING_ZERO.match(val):
+        try:
+            return int(val)
+        except ValueError:
+            pass
+        try:
+            return float(val)
+        except ValueError:
+            # Misplaced underscores, e.g. 2024_
+            pass
+
+    if val[:1] in ("[", "{"):
+        try:
+            return get_parser(".json").parse(val)
+        except ValueError:
+            pass
+
+    return val
+
+
+def _index_object(buf: Any) -> dict:
+    """Indexes the members of the top-level JSON object in the buffer.
+
+    :param buf: Buffer holding a JSON document
+    :raises ValueError: Raised if the document is not a JSON object
+    :return: dictionary of keys and (start, end) offsets of their values
+    """
+    offsets = dict()
+    pos = _skip_ws(buf, 0)
+
+    if buf[pos : pos + 1] != b"{":
+        raise ValueError("JSON document is not an object")
+    pos = _skip_ws(buf, pos + 1)
+
+    if buf[pos : pos + 1] == b"}":
+        return offsets
+
+    while True:
+        if buf[pos : pos + 1] != b'"':
+            raise ValueError(f"Expected a key at offset {pos}")
+        end = _skip_string(buf, pos)
+        key = _decode_key(buf[pos:end])
+
+        pos = _skip_ws(buf, end)
+        if buf[pos : pos + 1] != b":":
+            raise ValueError(f"Expected ':' at offset {pos}")
+
+        start = _skip_ws(buf, pos + 1)
+        end = _skip_value(buf, start)
+        offsets[key] = (start, end)
+
+        pos = _skip_ws(buf, end)
+        c = buf[pos : pos + 1]
+        if c == b"}":
+            return offsets
+        if c != b",":
+            raise ValueError(f"Expected ',' or '}}' at offset {pos}")
+        pos = _skip_ws(buf, pos + 1)
+
+
+def _decode_key(raw: bytes) -> str:
+    """Decodes a JSON string, incl. the quotes.
+
+    :param raw: Encoded string
+    :return: decoded string
+    """
+    if b"\\" not in raw:
+        return raw[1:-1].decode()
+    return json_loads(raw)
+
+
+def _skip_ws(buf: Any, pos: int) -> int:
+    """Skips whitespace.
+
+    :return: offset of the next non-whitespace character
+    """
+    return _WHITESPACE.match(buf, pos).end()
+
+
+def _skip_string(buf: Any, pos: int) -> int:
+    """Skips a string, which starts at pos with a quote.
+
+    :return: offset after the closing quote
+    """
+    pos += 1
+    while True:
+        m = _STRING_END.search(buf, pos)
+        if m is None:
+            raise ValueError("Unterminated string")
+        if m.group() == b"\\":
+            pos = m.end() + 1
+        else:
+            return m.end()
+
+
+def _skip_value(buf: Any, pos: int) -> int:
+    """Skips a JSON value, which starts at pos.
+
+    :return: offset after the value
+    """
+    c = buf[pos : pos + 1]
+
+    if c == b'"':
+        return _skip_string(buf, pos)
+
+    if c not in (b"{", b"["):
+        m = _SCALAR_END.search(buf, pos)
+        return len(buf) if m is None else m.start()
+
+    end = _skip_brackets(buf, pos)
+    if end >= 0 and buf.find(b"\\", pos, end) < 0:
+        return end
+
+    # Escaped quotes break the fast path, fall back to skip strings as a whole
+    depth = 0
+    while True:
+        m = _STRUCTURE.search(buf, pos)
+        if m is None:
+            raise ValueError("Unterminated object or array")
+
+        c = m.group()
+        if c == b'"':
+            pos = _skip_string(buf, m.start())
+            continue
+
+        depth += 1 if c in (b"{", b"[") else -1
+        pos = m.end()
+        if depth == 0:
+            return pos
+
+
+def _skip_brackets(buf: Any, pos: int) -> int:
+    """Skips an object or array, which starts at pos. Brackets inside of
+    strings are detected by the parity of the quotes in front of them, hence
+    the result is only correct, if there are no escaped quotes.
+
+    :return: offset after the object or array, -1 if it is not terminated
+    """
+    depth = 0
+    inside = 0
+    last = pos
+
+    for m in _BRACKETS.finditer(buf, pos):
+        p = m.start()
+        inside ^= buf[last:p].count(b'"') & 1
+        last = p
+        if inside:
+            continue
+
+        depth += 1 if buf[p] in b"{[" else -1
+        if depth == 0:
+            return p + 1
+
+    return -1
@@ -2,7 +2,14 @@
 """
 
 # standard lib
-from typing import Any, Union
+from collections import deque
+from copy import deepcopy
+from typing import Any, Iterator, Mapping, Tuple, Union
+
+_MISSING = object()
+
+# mutable values, which are copied when merged
+_MUTABLE = (list, set, bytearray)
 
 
 def _get_depth(d: Any, depth=1) -> int:
@@ -20,6 +27,9 @@ def add_dot_notations(d: dict, seperator: str) -> dict:
     """Takes a dictionary as input and concatenates the different keys together
     to access each configuration parameter with a single key.
 
+    The dictionary is modified in place, nested dictionaries included. Prefer
+    `flatten`, which does not modify the input and runs in linear time.
+
     :param conf: configuration where the dot notation should be added.
     :param seperator: Seperating character to use for the dot-notation.
     :return: Updated dictionary which includes the dot notations
@@ -39,6 +49,258 @@ def add_dot_notations(d: dict, seperator: str) -> dict:
     return d
 
 
+def lookup(d: dict, key: str, seperator: str, default: Any = None) -> Any:
+    """Looks up a key in a (nested) dictionary. The key may concatenate the
+    keys of nested sections with the seperator, e.g. `api.hostname`. A key
+    which exists literally in a section takes precedence over its dot
+    notation. Values which are `None` are treated as missing.
+
+    The lookup walks the dictionary iteratively and does not copy anything.
+
+    :param d: Dictionary to search through
+    :param key: Requested key, optionally in dot-notation
+    :param seperator: Seperating character of the dot-notation
+    :param default: Default value to return
+    :return: Value of the requested key
+    """
+    val = None
+
+    while isinstance(d, dict):
+        # If section contains key, return it
+        if key in d:
+            val = d[key]
+            break
+
+        # Last section to search through, if key not in here, skip
+        if seperator not in key:
+            break
+
+        k, key = key.split(seperator, 1)
+        d = d.get(k)
+
+    return default if val is None else val
+
+
+def find(d: dict, key: str, seperator: str, missing: Any = None) -> Any:
+    """Looks up a key just like `lookup`, but tells a missing key apart from
+    a value which is `None`.
+
+    :param d: Dictionary to search through
+    :param key: Requested key, optionally in dot-notation
+    :param seperator: Seperating character of the dot-notation
+    :param missing: Value to return, if the key does not exist
+    :return: Value of the requested key, None if it is stored as None
+    """
+    while isinstance(d, dict):
+        if key in d:
+            return d[key]
+
+        if seperator not in key:
+            break
+
+        k, key = key.split(seperator, 1)
+        d = d.get(k)
+
+    return missing
+
+
+def iter_flat(d: dict, seperator: str) -> Iterator[Tuple[str, Any]]:
+    """Iterates over all keys of a (nested) dictionary in dot-notation and
+    their values, sections included. The dictionary is traversed level by
+    level without recursion and without modifying it.
+
+    :param d: Dictionary to iterate
+    :param seperator: Seperating character to use for the dot-notation.
+    :return: iterator of keys in dot-notation and values
+    """
+    queue = deque([("", d)])
+
+    while queue:
+        prefix, section = queue.popleft()
+        for k, v in section.items():
+            key = f"{prefix}{k}"
+            yield key, v
+            if isinstance(v, dict) and v:
+                queue.append((f"{key}{seperator}", v))
+
+
+def flatten(d: dict, seperator: str) -> dict:
+    """Builds a flat dictionary, which maps each key of the (nested) dictionary
+    in dot-notation to its value. Sections are contained as well and map to
+    the original, nested dictionaries. The input is not modified and the cost
+    is linear in the total number of keys.
+
+    The dictionary is traversed level by level. Hence, if the same key in
+    dot-notation can be built in several ways, the one closest to the root
+    wins.
+
+    :param d: Dictionary to flatten
+    :param seperator: Seperating character to use for the dot-notation.
+    :return: flat dictionary
+    """
+    flat = {}
+
+    for k, v in iter_flat(d, seperator):
+        if k not in flat:
+            flat[k] = v
+
+    return flat
+
+
+def same(this: Any, other: Any) -> bool:
+    """Checks whether two values are equal, including their types. Unlike
+    `==`, `1` and `1.0` or `[1]` and `[1.0]` are not the same.
+
+    :param this: First value
+    :param other: Second value
+    :return: True if the values and their types are equal
+    """
+    if this is other:
+        return True
+    if type(this) is not type(other):
+        return False
+    if isinstance(this, (list, tuple)):
+        return len(this) == len(other) and all(map(same, this, other))
+    if isinstance(this, dict):
+        return this.keys() == other.keys() and all(same(v, other[k]) for k, v in this.items())
+    return this == other
+
+
+def merge(this: dict, other: dict) -> dict:
+    """Merges two dictionaries into a new one, the values of other take
+    precedence. Neither of the dictionaries is modified.
+
+    The merge shares structure with this: sections, which are not changed by
+    other, are reused by reference. New dictionaries are only allocated along
+    the paths which actually differ. If other does not change anything, this
+    itself is returned. Sections and mutable values of other are copied, the
+    result never refers to them.
+
+    The dictionaries are traversed iteratively, hence the depth of the
+    dictionaries is not limited by the recursion limit.
+
+    :param this: Dictionary to merge into
+    :param other: Other dictionary to merge into the first one.
+    :return: Merged dictionary
+    """
+    # A frame consists of: base section, iterator over the other section,
+    # copy of the base section (None until changed), parent frame and key
+    root = [this, iter(other.items()), None, None, None]
+    stack = [root]
+
+    while stack:
+        frame = stack[-1]
+        base = frame[0]
+
+        for k, v in frame[1]:
+            old = base.get(k, _MISSING)
+
+            if isinstance(v, dict) and isinstance(old, dict):
+                stack.append([old, iter(v.items()), None, frame, k])
+                break
+
+            if old is v or same(old, v):
+                continue
+
+            if frame[2] is None:
+                frame[2] = dict(base)
+            frame[2][k] = _copy(v)
+        else:
+            # Section is completely merged, hand it to the parent
+            stack.pop()
+            parent = frame[3]
+            if parent is not None and frame[2] is not None:
+                if parent[2] is None:
+                    parent[2] = dict(parent[0])
+                parent[2][frame[4]] = frame[2]
+
+    return this if root[2] is None else root[2]
+
+
+def unflatten(d: Mapping, seperator: str, into: dict = None) -> dict:
+    """Builds a nested dictionary out of a dictionary with keys in
+    dot-notation, e.g. `{"api.hostname": "localhost"}`. The inverse of
+    `flatten`. Later keys take precedence, dictionaries are merged.
+
+    :param d: Dictionary with keys in dot-notation
+    :param seperator: Seperating character of the dot-notation.
+    :param into: Nested dictionary to add the keys to, modified in place
+    :return: nested dictionary
+    """
+    into = {} if into is None else into
+
+    for key, val in d.items():
+        *path, last = key.split(seperator)
+        node = into
+        for k in path:
+            child = node.get(k)
+            if not isinstance(child, dict):
+                child = node[k] = {}
+            node = child
+
+        old = node.get(last)
+        node[last] = merge(old, val) if isinstance(old, dict) and isinstance(val, dict) else val
+
+    return into
+
+
+def replaces(d: dict, flat: Mapping, seperator: str) -> bool:
+    """Checks whether unflattening keys into a dictionary would turn one of
+    its values into a section. Merged on top of a configuration, such a
+    section would be merged with the section of the configuration, while the
+    value replaced the section before. Hence, the keys need to be merged on
+    their own, after the dictionary.
+
+    :param d: Nested dictionary to add the keys to
+    :param flat: Dictionary with keys in dot-notation
+    :param seperator: Seperating character of the dot-notation.
+    :return: True if a value of d would be replaced by a section
+    """
+    for key, val in flat.items():
+        *path, last = key.split(seperator)
+        node = d
+        for k in path:
+            node = node.get(k, _MISSING)
+            if not isinstance(node, dict):
+                # A missing section is created, a value is replaced
+                if node is not _MISSING:
+                    return True
+                break
+        else:
+            old = node.get(last, _MISSING)
+            if isinstance(val, dict) and old is not _MISSING and not isinstance(old, dict):
+                return True
+
+    return False
+
+
+def _copy(val: Any) -> Any:
+    """Copies a value. Dictionaries are copied iteratively, just like mutable
+    values inside of them. Immutable values are returned as they are.
+
+    :param val: Value to copy
+    :return: copied value
+    """
+    if not isinstance(val, dict):
+        return deepcopy(val) if isinstance(val, _MUTABLE) else val
+
+    root = {}
+    stack = [(root, val)]
+
+    while stack:
+        dst, src = stack.pop()
+        for k, v in src.items():
+            if isinstance(v, dict):
+                dst[k] = {}
+                stack.append((dst[k], v))
+            elif isinstance(v, _MUTABLE):
+                dst[k] = deepcopy(v)
+            else:
+                dst[k] = v
+
+    return root
+
+
 def deep_update(this: dict, other: dict) -> dict:
     """Recursively updates the values of a dictionary.
     Just as with the regular dict.update() implementation does the function
@@ -0,0 +1,164 @@
+"""Watches the files of a configuration and reloads it on changes.
+"""
+
+# standard lib
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+from typing import Any, List
+
+# inotify constants, see <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")
+
+
+def _libc() -> Any:
+    """Loads the C library, if it provides the inotify API.
+
+    :return: libc or None, if inotify is not available
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
+
+
+class Watcher:
+    """A Watcher observes the file inputs of a configuration and reloads the
+    configuration as soon as one of the files changes. Only the changed files
+    are read again, see `Configuration.reload()`.
+
+    On Linux, the watcher uses inotify to get notified about changes. On other
+    platforms, or if inotify is not available, the watcher falls back to poll
+    the modification time and size of the files.
+
+    The watcher runs in a daemon thread. Errors while reloading, e.g. a file
+    which is only partially written, are stored in `error` and the previous
+    configuration stays active until the next change.
+    """
+
+    def __init__(self, config: Any, interval: float = 1.0, inotify: bool = True):
+        """Creates a new watcher. Call `start()` to start watching.
+
+        :param config: Configuration to reload
+        :param interval: Polling interval in seconds
+        :param inotify: Use inotify, if available
+        """
+        self.config = config
+        self.interval = interval
+        self.error = None
+        self._files = {os.path.abspath(p): p for p in config.input_files()}
+        self._libc = _libc() if inotify else None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self) -> "Watcher":
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def inotify(self) -> bool:
+        """Whether the watcher uses inotify or falls back to polling."""
+        return self._libc is not None
+
+    def start(self) -> "Watcher":
+        """Starts watching in a background thread.
+
+        :return: the watcher itself
+        """
+        target, args = self._run_polling, ()
+        if self.inotify:
+            # Watches are added before returning, no change may get lost
+            fd, dirs = self._init_inotify()
+            if fd >= 0:
+                target, args = self._run_inotify, (fd, dirs)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=target, args=args, name="yacf-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops watching and waits for the background thread to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _reload(self, paths: List[str]):
+        """Reloads the configuration for the given files.
+
+        :param paths: Files which (possibly) changed
+        """
+        try:
+            self.config.reload(*paths)
+            self.error = None
+        except Exception as e:
+            self.error = e
+
+    def _run_polling(self):
+        """Polls the files for changes until the watcher is stopped."""
+        while not self._stop.wait(self.interval):
+            self._reload(list(self._files.values()))
+
+    def _init_inotify(self) -> tuple:
+        """Creates an inotify instance, which watches the parent directories of
+        the files. Directories are watched, since editors often replace files
+        instead of writing them in place and files may be symlinks, whose
+        targets are swapped, e.g. the `..data` link of a Kubernetes ConfigMap.
+
+        :return: file descriptor (negative on errors) and watched directories
+        """
+        fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        dirs = {}
+
+        for p in self._files if fd >= 0 else []:
+            d = os.path.dirname(p)
+            wd = self._libc.inotify_add_watch(fd, d.encode(), mask)
+            if wd >= 0:
+                dirs[wd] = d
+
+        return fd, dirs
+
+    def _run_inotify(self, fd: int, dirs: dict):
+        """Waits for inotify events until the watcher is stopped.
+
+        :param fd: File descriptor of the inotify instance
+        :param dirs: Watched directories by watch descriptor
+        """
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([fd], [], [], self.interval)
+                if not ready:
+                    continue
+
+                buf = os.read(fd, 64 * 1024)
+                touched = set()
+                offset = 0
+                while offset < len(buf):
+                    wd, _, _, size = _EVENT.unpack_from(buf, offset)
+                    offset += _EVENT.size + size
+                    touched.add(dirs.get(wd))
+
+                # Any event may swap a symlink to a file, e.g. `..data`, all
+                # files of the directory are checked, unchanged ones are skipped
+                changed = [f for p, f in self._files.items() if os.path.dirname(p) in touched]
+                if changed:
+                    self._reload(changed)
+        finally:
+            os.close(fd)